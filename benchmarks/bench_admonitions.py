@@ -0,0 +1,46 @@
+"""
+Admonition titles translation of pages of growing size with one admonition.
+
+    python benchmarks/bench_admonitions.py --sizes 14000 88000 --fences 0 10
+"""
+
+import argparse
+
+from common import timer
+
+from mkdocs_static_i18n.admonitions import AdmonitionTranslator
+
+PARAGRAPH = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor.\n\n"
+CODE_BLOCK = "```python\nprint('!!! not an admonition')\n```\n\n"
+
+
+def make_markdown(size, fences):
+    """
+    Return a markdown of about size characters with an admonition in its middle and a
+    fenced code block every 100 paragraphs.
+    """
+    blocks = []
+    while sum(len(block) for block in blocks) < size:
+        blocks.append(CODE_BLOCK if len(blocks) % 100 < fences else PARAGRAPH)
+    middle = len(blocks) // 2
+    return "".join(blocks[:middle] + ["!!! tip\n    Admonition\n\n"] + blocks[middle:])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[14000, 88000])
+    parser.add_argument("--fences", type=int, nargs="+", default=[0, 10])
+    parser.add_argument("--runs", type=int, default=1000)
+    args = parser.parse_args()
+
+    translator = AdmonitionTranslator({"tip": "Conseil"}, details=True)
+    for size in args.sizes:
+        for fences in args.fences:
+            markdown = make_markdown(size, fences)
+            with timer(f"{args.runs} x {len(markdown)} chars, {fences}% code blocks"):
+                for _ in range(args.runs):
+                    translator.translate(markdown)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Micro-benchmark of the files alternates resolution of each language build.
+
+    python benchmarks/bench_alternates.py --locales 20 --pages 5000
+"""
+
+import argparse
+from types import SimpleNamespace
+
+from common import make_site, timer
+
+from mkdocs_static_i18n.catalog import I18nCatalog
+
+
+def resolve_alternates(i18n_plugin, catalog):
+    for locale in i18n_plugin.build_languages:
+        i18n_src_uris = {
+            norm_src_uri: SimpleNamespace(alternates={locale: None})
+            for norm_src_uri in catalog.norm_src_uris
+        }
+        i18n_plugin.reconfigure_files_alternates(i18n_src_uris, catalog)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--structure", choices=["suffix", "folder"], default="suffix")
+    parser.add_argument("--locales", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5000)
+    args = parser.parse_args()
+
+    i18n_plugin, mkdocs_config, files = make_site(args.structure, args.locales, args.pages)
+    print(f"{len(files)} files, {args.locales} locales, {args.structure} structure")
+
+    with timer("catalog"):
+        catalog = I18nCatalog(i18n_plugin, files, mkdocs_config)
+    with timer("alternates of every language (cold)"):
+        resolve_alternates(i18n_plugin, catalog)
+    with timer("alternates of every language (warm)"):
+        resolve_alternates(i18n_plugin, catalog)
+    with timer("url of every alternate"):
+        for alternate in catalog.alternates.values():
+            alternate.url
+    print(f"{len(catalog.alternates)} alternates")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Micro-benchmark of the i18n files creation of each language build.
+
+    python benchmarks/bench_create_i18n_file.py --structure folder --locales 60 --pages 5000
+"""
+
+import argparse
+
+from common import make_site, timer
+
+from mkdocs_static_i18n import folder, suffix
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--structure", choices=["suffix", "folder"], default="suffix")
+    parser.add_argument("--locales", type=int, default=60)
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--builds", type=int, default=3)
+    args = parser.parse_args()
+
+    i18n_plugin, mkdocs_config, files = make_site(args.structure, args.locales, args.pages)
+    print(f"{len(files)} files, {args.locales} locales, {args.structure} structure")
+    if args.structure == "suffix":
+        create_i18n_file = suffix.create_i18n_file
+    else:
+        create_i18n_file = folder.create_i18n_file
+
+    default_language = i18n_plugin.default_language
+    all_languages = i18n_plugin.all_languages
+    for locale in i18n_plugin.build_languages[: args.builds]:
+        with timer(f"create i18n files of the '{locale}' build"):
+            for file in files:
+                create_i18n_file(
+                    file,
+                    locale,
+                    default_language,
+                    all_languages,
+                    mkdocs_config,
+                ).url
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""
+Micro-benchmark of the links resolution of a language build.
+
+    python benchmarks/bench_get_file_from_path.py --structure folder --locales 60 --pages 5000
+"""
+
+import argparse
+
+from common import make_site, timer
+
+from mkdocs_static_i18n import folder, suffix
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--structure", choices=["suffix", "folder"], default="suffix")
+    parser.add_argument("--locales", type=int, default=60)
+    parser.add_argument("--pages", type=int, default=5000)
+    parser.add_argument("--links", type=int, default=10)
+    args = parser.parse_args()
+
+    i18n_plugin, mkdocs_config, files = make_site(args.structure, args.locales, args.pages)
+    print(f"{len(files)} files, {args.locales} locales, {args.structure} structure")
+    module = suffix if args.structure == "suffix" else folder
+
+    i18n_plugin.current_language = i18n_plugin.build_languages[1]
+    with timer(f"i18n files of the '{i18n_plugin.current_language}' build"):
+        i18n_files = module.I18nFiles(i18n_plugin, files)
+    # links as written by users: to the non localized or localized files
+    paths = [file.src_uri for file in files] + [
+        f"section{idx % 50}/page{idx}.md" for idx in range(args.pages)
+    ]
+    paths.append(".")
+    with timer(f"resolve {len(paths) * args.links} links"):
+        for _ in range(args.links):
+            for path in paths:
+                i18n_files.get_file_from_path(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+"""
+Memory used by the i18n files (and their alternates) of every language build.
+
+    python benchmarks/bench_memory.py --locales 20 --pages 2000
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from common import make_site, timer
+
+from mkdocs_static_i18n.catalog import I18nCatalog
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--structure", choices=["suffix", "folder"], default="suffix")
+    parser.add_argument("--locales", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=2000)
+    parser.add_argument("--assets", type=int, default=2000)
+    args = parser.parse_args()
+
+    i18n_plugin, mkdocs_config, files = make_site(
+        args.structure, args.locales, args.pages, args.assets
+    )
+    print(f"{len(files)} files, {args.locales} locales, {args.structure} structure")
+
+    gc.collect()
+    tracemalloc.start()
+    builds = []
+    with timer("i18n files of every language build"):
+        i18n_plugin.i18n_catalog = I18nCatalog(i18n_plugin, files, mkdocs_config)
+        for locale in i18n_plugin.build_languages:
+            i18n_plugin.current_language = locale
+            builds.append(i18n_plugin.reconfigure_files(files, mkdocs_config))
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    print(
+        f"{'memory of the i18n files':<50} {current / 2**20:8.1f}MiB (peak {peak / 2**20:.1f}MiB)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Scaling of the search index deduplication with the number of search entries.
+
+    python benchmarks/bench_search_duplicates.py --locales 12 --entries 1000 5000 15000
+"""
+
+import argparse
+
+from common import make_site, timer
+
+
+def make_search_entries(languages, entries):
+    """
+    Return the search entries of every language build where half of the pages are not
+    translated and use the default language version as a fallback.
+    """
+    default_language, *other_languages = languages
+    search_entries = []
+    for idx in range(entries):
+        search_entries.append(
+            {
+                "location": f"section{idx % 50}/page{idx}/",
+                "title": f"Page {idx}",
+                "text": f"text {idx}",
+            }
+        )
+    for language in other_languages:
+        for idx in range(entries):
+            text = f"text {idx}" if idx % 2 else f"{language} text {idx}"
+            search_entries.append(
+                {
+                    "location": f"{language}/section{idx % 50}/page{idx}/",
+                    "title": f"Page {idx}",
+                    "text": text,
+                }
+            )
+    return search_entries
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--locales", type=int, default=12)
+    parser.add_argument("--entries", type=int, nargs="+", default=[1000, 5000, 15000])
+    args = parser.parse_args()
+
+    i18n_plugin, mkdocs_config, files = make_site("suffix", args.locales, pages=0)
+    for entries in args.entries:
+        search_entries = make_search_entries(i18n_plugin.build_languages, entries)
+        label = f"deduplicate {len(search_entries)} search entries"
+        with timer(label):
+            i18n_plugin.reconfigure_search_duplicates(search_entries)
+        print(f"{'':<50} {len(search_entries)} entries left")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Helpers to setup synthetic sites for the benchmarks.
+"""
+
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from mkdocs.config.base import load_config
+from mkdocs.structure.files import File, Files
+
+LOCALES = [
+    "en", "fr", "de", "es", "it", "pt", "nl", "sv", "da", "fi", "no", "pl", "cs", "hu", "ro",
+    "ru", "uk", "tr", "el", "bg", "hr", "sk", "sl", "lt", "lv", "et", "ja", "ko", "zh", "vi",
+    "th", "id", "ms", "hi", "bn", "ta", "te", "kn", "ml", "mr", "gu", "pa", "ur", "fa", "ar",
+    "he", "sw", "af", "sq", "hy", "az", "eu", "be", "bs", "ca", "cy", "eo", "gl", "ka", "is",
+]  # fmt: skip
+
+
+def make_site(structure="suffix", locales=20, pages=1000, assets=0, use_directory_urls=True):
+    """
+    Return an i18n plugin, its MkDocs config and the Files of a synthetic site where
+    every page and asset is localized in half of the languages.
+    """
+    languages = LOCALES[:locales]
+    # the files of the site are never read, the docs_dir only exists for the config validation
+    with tempfile.TemporaryDirectory(prefix="mkdocs-static-i18n-bench-") as tmp_dir:
+        root = Path(tmp_dir)
+        (root / "docs").mkdir()
+        (root / "mkdocs.yml").write_text("site_name: bench\nsite_url: http://localhost/\n")
+        mkdocs_config = load_config(
+            str(root / "mkdocs.yml"),
+            theme={"name": "mkdocs"},
+            use_directory_urls=use_directory_urls,
+            plugins={
+                "i18n": {
+                    "docs_structure": structure,
+                    "languages": [
+                        {"locale": locale, "name": locale, "default": idx == 0}
+                        for idx, locale in enumerate(languages)
+                    ],
+                }
+            },
+        )
+    i18n_plugin = mkdocs_config.plugins["i18n"]
+    i18n_plugin.current_language = i18n_plugin.default_language
+
+    def src_paths(name):
+        for idx, locale in enumerate(languages):
+            if idx % 2:
+                continue
+            if structure == "suffix":
+                stem, ext = name.rsplit(".", 1)
+                yield name if idx == 0 else f"{stem}.{locale}.{ext}"
+            else:
+                yield f"{locale}/{name}"
+
+    paths = []
+    for idx in range(pages):
+        paths.extend(src_paths(f"section{idx % 50}/page{idx}.md"))
+    for idx in range(assets):
+        paths.extend(src_paths(f"assets/image{idx}.png"))
+    files = Files(
+        [
+            File(path, mkdocs_config.docs_dir, mkdocs_config.site_dir, use_directory_urls)
+            for path in sorted(paths)
+        ]
+    )
+    return i18n_plugin, mkdocs_config, files
+
+
+@contextmanager
+def timer(label):
+    start = time.perf_counter()
+    yield
+    print(f"{label:<50} {time.perf_counter() - start:8.3f}s")
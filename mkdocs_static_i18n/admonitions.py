@@ -0,0 +1,107 @@
+"""
+Translate the implicit titles of the admonitions (and details) of the pages markdown
+(see the 'admonition_translations' option of the languages).
+
+The translations and the patterns are prepared once per language build. Only the lines
+starting with a fence or an admonition marker are looked at, the fenced code blocks
+being left untouched. Pages without any admonition marker are not even scanned.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Pattern, Tuple
+
+ADMONITION_MARKER = r"!{3}"
+DETAILS_MARKER = r"(?:\?{3}\+?|!{3})"
+
+
+@lru_cache(maxsize=2)
+def get_admonition_patterns(details: bool) -> Tuple[Pattern, Pattern]:
+    """
+    Return the pattern finding the lines opening a fenced code block or starting with an
+    admonition (and details) marker and the pattern matching the admonition lines.
+
+    Both look for the line feed before the lines which is way faster than trying a ^
+    anchor at every position of the markdown.
+    """
+    marker = DETAILS_MARKER if details else ADMONITION_MARKER
+    line_pattern = re.compile(
+        # the info string of a backtick fence can't contain backticks, think ```x``` text
+        rf"\n[ \t]*(?:(?P<fence>`{{3,}}(?=[^`\n]*(?:\n|\Z))|~{{3,}})|{marker})"
+    )
+    admonition_pattern = re.compile(
+        # Copied from https://github.com/Python-Markdown/markdown/blob/master/markdown/extensions/admonition.py and modified for a single-line processing
+        # Adapted to match the details extension as well
+        r"(?P<indent>[ \t]*)"  # leading spaces/tabs
+        r"(?P<marker>" + marker + r" ?)"  # marker (!!!, ???, ???+)
+        r"(?P<type>[\w\-]+(?: +[\w\-]+)*)"  # type (info, warning, etc.)
+        r'(?: +"(?P<title>.*?)")?'  # optional title in quotes
+        r" *\r?"  # optional trailing spaces (and carriage return)
+    )
+    return line_pattern, admonition_pattern
+
+
+@lru_cache(maxsize=32)
+def get_closing_fence_pattern(fence: str) -> Pattern:
+    return re.compile(r"\n[ \t]*" + fence + r"[`~]*[ \t]*\r?(?=\n|\Z)")
+
+
+class AdmonitionTranslator:
+    """
+    Translate the admonitions without an explicit title of the pages of a language.
+    """
+
+    def __init__(self, admonition_translations: Optional[Dict[str, str]], details: bool):
+        # Force lowercase keys for case insensitive matching
+        self.translations = {k.lower(): v for k, v in (admonition_translations or {}).items()}
+        self.markers = ("!!!", "???") if details else ("!!!",)
+        self.line_pattern, self.admonition_pattern = get_admonition_patterns(details)
+
+    def needs_translation(self, markdown: str) -> bool:
+        return bool(self.translations) and any(marker in markdown for marker in self.markers)
+
+    def translate(self, markdown: str) -> Tuple[str, int]:
+        """
+        Return the translated markdown and the number of translated titles.
+        """
+        if not self.needs_translation(markdown):
+            return markdown, 0
+        translated = 0
+        chunks = []
+        position = 0
+        # the line feed before a line is the position of the line in the markdown
+        text = f"\n{markdown}"
+        match = self.line_pattern.search(text)
+        while match is not None:
+            fence = match.group("fence")
+            if fence is not None:
+                # skip the fenced code block, up to its closing fence or the end of the markdown
+                match = get_closing_fence_pattern(fence).search(text, match.end())
+                if match is None:
+                    break
+                match = self.line_pattern.search(text, match.end())
+                continue
+            start = match.start()
+            end = text.find("\n", match.end())
+            if end == -1:
+                end = len(text)
+            admonition = self.admonition_pattern.fullmatch(text, start + 1, end)
+            match = self.line_pattern.search(text, match.end())
+            if admonition is None:
+                continue
+            title = admonition.group("title")
+            admonition_type = admonition.group("type")
+            new_title = self.translations.get(admonition_type.lower())
+            if new_title is None or (title and title.strip() != ""):
+                continue
+            translated += 1
+            chunks.append(markdown[position:start])
+            chunks.append(
+                f'{admonition.group("indent")}{admonition.group("marker")}{admonition_type} "{new_title}"'
+            )
+            # keep the carriage return of the line if any
+            position = end - 2 if text.endswith("\r", start + 1, end) else end - 1
+        if not translated:
+            return markdown, 0
+        chunks.append(markdown[position:])
+        return "".join(chunks), translated
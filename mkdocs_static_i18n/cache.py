@@ -0,0 +1,123 @@
+"""
+Persistent cache of the markdown transforms of the plugin (see the 'markdown_cache_dir'
+option).
+
+The transformed markdown of a page is stored in its own file named after the digest of
+its source markdown and of everything the transforms depend on (the plugin version, the
+language, its admonition translations and the markdown extensions). Unchanged pages, like the fallback
+pages of a language, are then read back from the cache on the following builds.
+
+Entries are touched when read so that the least recently used ones are evicted first
+when the cache exceeds its maximum size.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Iterable, Optional, Tuple
+
+from mkdocs.plugins import get_plugin_logger
+
+from mkdocs_static_i18n import version
+
+log = get_plugin_logger(__name__)
+
+# bump when the markdown transforms change their output between two plugin versions
+CACHE_FORMAT = 1
+
+
+class MarkdownCache:
+    """
+    On-disk cache of the transformed markdown of the pages, keyed by content digest.
+
+    Parallel builds workers share the same cache directory: entries are written to a
+    temporary file first and then moved in place.
+    """
+
+    def __init__(self, directory: str, max_size: int) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def get_context_digest(locale: str, admonition_translations: dict, extensions: Iterable):
+        """
+        Digest of everything but the markdown the transforms of a language depend on.
+        """
+        context = json.dumps(
+            [
+                CACHE_FORMAT,
+                version,
+                locale,
+                sorted((admonition_translations or {}).items()),
+                sorted(str(extension) for extension in extensions),
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.blake2b(context.encode("utf-8"), digest_size=16).hexdigest()
+
+    @property
+    def counts(self) -> Tuple[int, int]:
+        return self.hits, self.misses
+
+    def get_key(self, context_digest: str, markdown: str) -> str:
+        digest = hashlib.blake2b(context_digest.encode("ascii"), digest_size=20)
+        digest.update(markdown.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get_path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        path = self.get_path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                markdown, translated = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return markdown, translated
+
+    def set(self, key: str, markdown: str, translated: int) -> None:
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump([markdown, translated], f, ensure_ascii=False)
+            os.replace(tmp_path, self.get_path(key))
+        except OSError as e:
+            log.debug(f"Could not write the markdown cache entry {key}: {e}")
+
+    def evict(self) -> int:
+        """
+        Remove the least recently used entries until the cache fits its maximum size.
+
+        Return the number of removed entries.
+        """
+        entries = []
+        size = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                size += stat.st_size
+        removed = 0
+        for _, entry_size, path in sorted(entries):
+            if size <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+            removed += 1
+        return removed
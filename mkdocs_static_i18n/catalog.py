@@ -0,0 +1,221 @@
+from collections import defaultdict
+from typing import Dict, Iterable, NamedTuple, Optional
+
+from mkdocs.config.defaults import MkDocsConfig
+from mkdocs.plugins import get_plugin_logger
+from mkdocs.structure.files import File
+
+from mkdocs_static_i18n import folder, suffix
+from mkdocs_static_i18n.sitemap import format_lastmod, get_git_timestamps, get_mtime_timestamps
+
+log = get_plugin_logger(__name__)
+
+
+class I18nSource(NamedTuple):
+    """
+    A user provided file and its language classification.
+    """
+
+    file: File
+    locale: str
+    localization: Optional[str]
+    norm_src_uri: str
+
+
+class I18nAlternate:
+    """
+    Lazy alternate of a normalized src_uri for a given language.
+
+    Alternates are mostly used for their url by the sitemap.xml template and the
+    language switcher so the underlying i18n file (and its url and destination)
+    is only created when one of its attributes is first accessed.
+    """
+
+    __slots__ = ("_file", "catalog", "locale_alternate_of", "source_file")
+
+    # alternates are never part of a build so they have no Page
+    page = None
+
+    def __init__(self, catalog, source_file: File, locale: str) -> None:
+        self.catalog = catalog
+        self.source_file = source_file
+        self.locale_alternate_of = locale
+        self._file = None
+
+    @property
+    def file(self) -> File:
+        if self._file is None:
+            self._file = self.catalog.get_i18n_file(self.source_file, self.locale_alternate_of)
+        return self._file
+
+    def __getattr__(self, name):
+        return getattr(self.file, name)
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}({self.source_file.src_uri!r}, "
+            f"locale_alternate_of={self.locale_alternate_of!r})"
+        )
+
+
+class I18nCatalog:
+    """
+    Cross-language index of the user provided files.
+
+    Every file is classified once per build and indexed by its normalized (non localized)
+    src_uri so that each language build and the files alternates can be resolved with
+    lookups instead of creating i18n files over and over again.
+    """
+
+    def __init__(self, i18n_plugin, files: Iterable[File], mkdocs_config: MkDocsConfig) -> None:
+        self.i18n_plugin = i18n_plugin
+        self.mkdocs_config = mkdocs_config
+        if i18n_plugin.config.docs_structure == "suffix":
+            self.create_i18n_file = suffix.create_i18n_file
+        else:
+            self.create_i18n_file = folder.create_i18n_file
+        # src_uri -> I18nSource
+        self.src_uris: Dict[str, I18nSource] = {}
+        # norm_src_uri -> {locale: File}
+        self.norm_src_uris: Dict[str, Dict[str, File]] = defaultdict(dict)
+        # norm_src_uri -> {locale: File} used as alternates
+        self.alternate_files: Dict[str, Dict[str, File]] = {}
+        # (norm_src_uri, locale) -> I18nAlternate
+        self.alternates: Dict[tuple, I18nAlternate] = {}
+        # (src_uri, language) -> (user provided file, i18n file, dest_uri) of the files
+        # which are not documentation pages
+        self.i18n_files: Dict[tuple, tuple] = {}
+        # norm_src_uri -> {locale: last modification date}
+        self.lastmod_dates: Optional[Dict[str, Dict[str, str]]] = None
+        self.languages = i18n_plugin.language_registry
+        self.build_languages = sorted(self.languages.build_languages)
+        for file in files:
+            self.add(file)
+
+    def add(self, file: File) -> I18nSource:
+        """
+        Classify and index a user provided file.
+        """
+        i18n_file = self.create_i18n_file(
+            file,
+            self.languages.default_language,
+            self.languages.default_language,
+            self.languages.all_languages,
+            self.mkdocs_config,
+        )
+        source = I18nSource(file, i18n_file.locale, i18n_file.localization, i18n_file.norm_src_uri)
+        previous = self.src_uris.get(file.src_uri)
+        self.src_uris[file.src_uri] = source
+        locales = self.norm_src_uris[source.norm_src_uri]
+        if previous is not None and locales.get(source.locale) is previous.file:
+            locales[source.locale] = file
+        else:
+            locales.setdefault(source.locale, file)
+        return source
+
+    def get_i18n_file(self, file: File, language: str) -> File:
+        """
+        Return the i18n file of a user provided file for the given language build.
+
+        Files which are not documentation pages never get a Page attached so their i18n
+        file is the same in every language build (and in the alternates): it is created
+        once and shared instead of being created again for each language build.
+        """
+        if file.is_documentation_page():
+            return self.create_i18n_file(
+                file,
+                language,
+                self.languages.default_language,
+                self.languages.all_languages,
+                self.mkdocs_config,
+            )
+        key = (file.src_uri, language)
+        source_file, i18n_file, dest_uri = self.i18n_files.get(key, (None, None, None))
+        # other plugins (think material/blog) may have moved the i18n file in place
+        if source_file is not file or i18n_file.dest_uri != dest_uri:
+            i18n_file = self.create_i18n_file(
+                file,
+                language,
+                self.languages.default_language,
+                self.languages.all_languages,
+                self.mkdocs_config,
+            )
+            self.i18n_files[key] = (file, i18n_file, i18n_file.dest_uri)
+        return i18n_file
+
+    def get_source(self, file: File) -> Optional[I18nSource]:
+        """
+        Return the classification of the given file if it is part of the catalog.
+        """
+        source = self.src_uris.get(file.src_uri)
+        if source is not None and source.file is file:
+            return source
+        return None
+
+    def get_file(self, norm_src_uri: str, locale: str) -> Optional[File]:
+        """
+        Return the first user provided file of the given locale.
+        """
+        return self.norm_src_uris.get(norm_src_uri, {}).get(locale)
+
+    def get_alternate_files(self, norm_src_uri: str) -> Dict[str, File]:
+        """
+        Return the user provided files to use as the alternates of a normalized src_uri
+        for every built language, resolved in one pass over its localized files.
+        """
+        alternate_files = self.alternate_files.get(norm_src_uri)
+        if alternate_files is None:
+            locales = self.norm_src_uris.get(norm_src_uri, {})
+            # if fallbacking to default language is configured, languages without
+            # their own version of the file use the default version of the file
+            fallback_file = None
+            if self.i18n_plugin.config.fallback_to_default is True:
+                fallback_file = locales.get(self.languages.default_language)
+            alternate_files = {}
+            for locale in self.build_languages:
+                file = locales.get(locale, fallback_file)
+                if file is not None:
+                    alternate_files[locale] = file
+            self.alternate_files[norm_src_uri] = alternate_files
+        return alternate_files
+
+    def get_alternate(self, norm_src_uri: str, locale: str) -> Optional[I18nAlternate]:
+        """
+        Return the alternate to use for the given locale of a normalized src_uri.
+
+        Alternates only depend on the catalog files so they are shared by every
+        language build.
+        """
+        key = (norm_src_uri, locale)
+        alternate = self.alternates.get(key)
+        if alternate is None:
+            file = self.get_alternate_files(norm_src_uri).get(locale)
+            if file is None:
+                return None
+            alternate = self.alternates[key] = I18nAlternate(self, file, locale)
+        return alternate
+
+    def get_lastmod_dates(self) -> Dict[str, Dict[str, str]]:
+        """
+        Return the last modification date of the documentation pages of every language
+        by normalized src_uri, computed for every file at once on first access.
+        """
+        if self.lastmod_dates is None:
+            pages = [
+                file
+                for locales in self.norm_src_uris.values()
+                for file in locales.values()
+                if file.is_documentation_page()
+            ]
+            timestamps = None
+            if self.i18n_plugin.config.sitemap_lastmod == "git":
+                timestamps = get_git_timestamps(self.mkdocs_config.docs_dir)
+            if timestamps is None:
+                timestamps = get_mtime_timestamps(pages)
+            self.lastmod_dates = defaultdict(dict)
+            for norm_src_uri, locales in self.norm_src_uris.items():
+                for locale, file in locales.items():
+                    timestamp = timestamps.get(file.src_uri)
+                    if timestamp is not None and file.is_documentation_page():
+                        self.lastmod_dates[norm_src_uri][locale] = format_lastmod(timestamp)
+        return self.lastmod_dates
@@ -84,10 +84,19 @@ class I18nPluginConfig(Config):
     """ """
 
     build_only_locale = config_options.Optional(Locale(str))
+    compact_search_index = config_options.Type(bool, default=False)
     docs_structure = config_options.Choice(["folder", "suffix"], default="suffix")
     fallback_to_default = config_options.Type(bool, default=True)
+    markdown_cache_dir = config_options.Optional(config_options.Type(str))
+    markdown_cache_max_size = config_options.Type(int, default=64)
+    parallel_builds = config_options.Type(int, default=0)
     reconfigure_material = config_options.Type(bool, default=True)
     reconfigure_search = config_options.Type(bool, default=True)
+    search_index_per_language = config_options.Type(bool, default=False)
+    sitemap_index = config_options.Type(bool, default=False)
+    sitemap_lastmod = config_options.Choice(["build", "git", "mtime"], default="build")
+    sitemap_max_urls = config_options.Type(int, default=50000)
+    stream_search_entries = config_options.Type(bool, default=False)
     languages = config_options.ListOfItems(
         config_options.SubConfig(I18nPluginLanguage, validate=True)
     )
@@ -95,6 +104,36 @@ class I18nPluginConfig(Config):
     def validate(self):
         failed, warnings = super().validate()
         if not failed:
+            if self.parallel_builds < 0:
+                failed.append(
+                    (
+                        "parallel_builds",
+                        ValidationError(
+                            "The number of parallel_builds workers must be a positive integer "
+                            f"(or 0 to disable it), received '{self.parallel_builds}'."
+                        ),
+                    )
+                )
+            if self.markdown_cache_max_size <= 0:
+                failed.append(
+                    (
+                        "markdown_cache_max_size",
+                        ValidationError(
+                            "The markdown_cache_max_size must be a positive number of "
+                            f"megabytes, received '{self.markdown_cache_max_size}'."
+                        ),
+                    )
+                )
+            if not 0 < self.sitemap_max_urls <= 50000:
+                failed.append(
+                    (
+                        "sitemap_max_urls",
+                        ValidationError(
+                            "The sitemap_max_urls must be between 1 and 50000 (the sitemap "
+                            f"protocol limit), received '{self.sitemap_max_urls}'."
+                        ),
+                    )
+                )
             if self.build_only_locale:
                 # check that the build_only_locale is valid
                 if self.build_only_locale not in [lang.locale for lang in self.languages]:
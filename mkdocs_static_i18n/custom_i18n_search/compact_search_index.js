@@ -0,0 +1,13 @@
+
+// mkdocs-static-i18n: expand the texts shared by the entries of a compact search index
+var i18nOnScriptsLoaded = onScriptsLoaded;
+onScriptsLoaded = function () {
+  for (var i=0; i < data.docs.length; i++) {
+    var doc = data.docs[i];
+    if (doc.text_ref !== undefined) {
+      doc.text = data.docs[doc.text_ref].text;
+      delete doc.text_ref;
+    }
+  }
+  i18nOnScriptsLoaded();
+};
@@ -0,0 +1,23 @@
+// mkdocs-static-i18n: load the search index of the page language instead of the site one
+(function (index, localized) {
+  index = new URL(index, location.href).href;
+  localized = new URL(localized, location.href).href;
+  var localize = function (url) {
+    return new URL(url, location.href).href === index ? localized : url;
+  };
+  var open = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    var args = Array.prototype.slice.call(arguments);
+    args[1] = localize(url);
+    return open.apply(this, args);
+  };
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function (input, init) {
+      if (typeof input === "string" || input instanceof URL) {
+        input = localize(input);
+      }
+      return fetch.call(this, input, init);
+    };
+  }
+})
@@ -0,0 +1,230 @@
+from abc import ABCMeta, abstractmethod
+from collections.abc import MutableMapping
+from functools import lru_cache
+from pathlib import PurePath
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from mkdocs.structure.files import File, Files
+
+# resolutions can be None so we need another marker for the paths not resolved yet
+_missing = object()
+
+
+class I18nFileInfo:
+    """
+    Language classification of a user provided file.
+
+    The same record is shared by the i18n files of a user provided file in every
+    language build.
+    """
+
+    __slots__ = ("locale", "localization", "norm_src_uri")
+
+    def __init__(self, norm_src_uri: str, locale: str, localization: Optional[str]) -> None:
+        self.norm_src_uri = norm_src_uri
+        self.locale = locale
+        self.localization = localization
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}({self.norm_src_uri!r}, locale={self.locale!r}, "
+            f"localization={self.localization!r})"
+        )
+
+
+@lru_cache(maxsize=16)
+def get_language_positions(languages: Tuple[str, ...]) -> Dict[str, int]:
+    """
+    Return the position of each language in the alternates of the i18n files.
+    """
+    return {language: position for position, language in enumerate(sorted(languages))}
+
+
+class I18nAlternates(MutableMapping):
+    """
+    The alternate files of an i18n file by language.
+
+    Alternates are stored in a list indexed by the position of their language instead
+    of a dict per file. The language of the i18n file itself comes first, then the other
+    languages in alphabetical order.
+
+    The alternates of other locales (think plugins adding their own) are kept in a dict
+    like they used to be.
+    """
+
+    __slots__ = ("files", "locale", "overflow", "positions")
+
+    def __init__(self, positions: Dict[str, int], locale: str, file: File) -> None:
+        self.positions = positions
+        self.locale = locale
+        self.files = [None] * len(positions)
+        self.files[positions[locale]] = file
+        self.overflow = None
+
+    def __getitem__(self, locale: str) -> File:
+        position = self.positions.get(locale)
+        if position is None:
+            if self.overflow is None:
+                raise KeyError(locale)
+            return self.overflow[locale]
+        file = self.files[position]
+        if file is None:
+            raise KeyError(locale)
+        return file
+
+    def __setitem__(self, locale: str, file: File) -> None:
+        position = self.positions.get(locale)
+        if position is None:
+            if self.overflow is None:
+                self.overflow = {}
+            self.overflow[locale] = file
+        else:
+            self.files[position] = file
+
+    def __delitem__(self, locale: str) -> None:
+        self[locale]
+        position = self.positions.get(locale)
+        if position is None:
+            del self.overflow[locale]
+        else:
+            self.files[position] = None
+
+    def __contains__(self, locale) -> bool:
+        position = self.positions.get(locale)
+        if position is None:
+            return self.overflow is not None and locale in self.overflow
+        return self.files[position] is not None
+
+    def __iter__(self) -> Iterator[str]:
+        if self.locale in self:
+            yield self.locale
+        for locale, position in self.positions.items():
+            if locale != self.locale and self.files[position] is not None:
+                yield locale
+        if self.overflow is not None:
+            yield from self.overflow
+
+    def __len__(self) -> int:
+        overflow = 0 if self.overflow is None else len(self.overflow)
+        return len(self.files) - self.files.count(None) + overflow
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+class I18nFile(File):
+    """
+    A user provided file localized for a language build.
+
+    Its language classification (i18n_info) is shared with the i18n files of the other
+    language builds and the language being built is the one of its own alternate.
+    """
+
+    i18n_info: I18nFileInfo
+    alternates: I18nAlternates
+
+    @property
+    def norm_src_uri(self) -> str:
+        return self.i18n_info.norm_src_uri
+
+    @property
+    def locale(self) -> str:
+        return self.i18n_info.locale
+
+    @property
+    def localization(self) -> Optional[str]:
+        return self.i18n_info.localization
+
+    @property
+    def locale_alternate_of(self) -> str:
+        return self.alternates.locale
+
+
+class BaseI18nFiles(Files, metaclass=ABCMeta):
+    """
+    Files resolving the paths requested by MkDocs (internal links and nav entries) to
+    the i18n file to use for the current build language.
+
+    The resolution of the src_uri (and normalized src_uri) of every file is computed
+    in bulk and kept up to date when files are added or removed so that resolving a
+    link is a single dict lookup. Other requested paths are normalized and resolved
+    through a bounded cache.
+    """
+
+    resolve_path_cache_size = 1024
+
+    def __init__(self, plugin, files: Iterable[File]) -> None:
+        super().__init__(files)
+        self.plugin = plugin
+        self._resolve_path = lru_cache(maxsize=self.resolve_path_cache_size)(self.resolve_path)
+        self.build_resolutions()
+
+    @abstractmethod
+    def get_expected_src_uris(self, src_uri: str) -> Iterable[str]:
+        """
+        Return the src_uris to look for, by order of preference, to resolve a src_uri.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def get_requesting_src_uris(self, src_uri: str) -> Iterable[str]:
+        """
+        Return the src_uris which may expect the given src_uri when being resolved.
+        """
+        raise NotImplementedError
+
+    def resolve(self, src_uri: str) -> Optional[File]:
+        for expected_src_uri in self.get_expected_src_uris(src_uri):
+            file = self.src_uris.get(expected_src_uri)
+            if file:
+                return file
+        return None
+
+    def resolve_path(self, path: str) -> Optional[File]:
+        src_uri = PurePath(path).as_posix()
+        if src_uri == ".":
+            src_uri = "index.md"
+        file = self.resolutions.get(src_uri, _missing)
+        if file is _missing:
+            file = self.resolve(src_uri)
+        return file
+
+    def build_resolutions(self) -> None:
+        self.resolutions_language = self.plugin.current_language
+        self.resolutions = {}
+        for file in self:
+            for src_uri in (file.src_uri, getattr(file, "norm_src_uri", None)):
+                if src_uri is not None and src_uri not in self.resolutions:
+                    self.resolutions[src_uri] = self.resolve(src_uri)
+        self.resolutions["."] = self.resolutions.get("index.md", self.resolve("index.md"))
+        self._resolve_path.cache_clear()
+
+    def update_resolutions(self, src_uri: str) -> None:
+        """
+        Update the resolutions which depend on the given src_uri.
+        """
+        for requesting_src_uri in self.get_requesting_src_uris(src_uri):
+            if src_uri in self.get_expected_src_uris(requesting_src_uri):
+                self.resolutions[requesting_src_uri] = self.resolve(requesting_src_uri)
+                if requesting_src_uri == "index.md":
+                    self.resolutions["."] = self.resolutions[requesting_src_uri]
+        self._resolve_path.cache_clear()
+
+    def append(self, file: File) -> None:
+        super().append(file)
+        self.update_resolutions(file.src_uri)
+
+    def remove(self, file: File) -> None:
+        super().remove(file)
+        self.update_resolutions(file.src_uri)
+
+    def get_file_from_path(self, path: str) -> Optional[File]:
+        """
+        Used by mkdocs.structure.nav.get_navigation to find resources linked in markdown.
+        """
+        if self.resolutions_language != self.plugin.current_language:
+            self.build_resolutions()
+        file = self.resolutions.get(path, _missing)
+        if file is _missing:
+            file = self._resolve_path(path)
+        return file
@@ -1,17 +1,95 @@
-import os
-from pathlib import Path, PurePath
-from typing import Optional
+import posixpath
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.plugins import get_plugin_logger
-from mkdocs.structure.files import File, Files
+from mkdocs.structure.files import File
 
-from mkdocs_static_i18n import is_relative_to
 from mkdocs_static_i18n.config import RE_LOCALE
+from mkdocs_static_i18n.files import (
+    BaseI18nFiles,
+    I18nAlternates,
+    I18nFile,
+    I18nFileInfo,
+    get_language_positions,
+)
 
 log = get_plugin_logger(__name__)
 
 
+class LocalePrefixIndex:
+    """
+    Resolve the first component of a path to the locale of its language folder.
+
+    The index is built from the configured locales and remembers the language
+    folders which are not configured in the plugin.languages yet so that each
+    resolution is a single dict lookup.
+    """
+
+    def __init__(self, languages: Tuple[str, ...], default_language: str) -> None:
+        # first path component -> locale (or None)
+        self.prefixes: Dict[str, Optional[str]] = {language: language for language in languages}
+        self.default_language = default_language
+        self.language_positions = get_language_positions(languages)
+        # src_uri -> I18nFileInfo
+        self.i18n_infos: Dict[str, I18nFileInfo] = {}
+
+    def get_locale(self, path: str) -> Optional[str]:
+        """
+        Return the locale of the language folder of a posix path, if any.
+        """
+        prefix = path.partition("/")[0]
+        try:
+            return self.prefixes[prefix]
+        except KeyError:
+            # maybe the language folder is present BUT not configured in the plugin.languages yet
+            # so we use the locale regex to guess that it's a localization folder
+            locale = self.prefixes[prefix] = prefix if RE_LOCALE.match(prefix) else None
+            return locale
+
+    def get_i18n_info(self, src_uri: str) -> I18nFileInfo:
+        """
+        Return the language classification of a user provided file.
+        """
+        i18n_info = self.i18n_infos.get(src_uri)
+        if i18n_info is None:
+            localization = self.get_locale(src_uri)
+            # compute the normalized (non localized) src_uri
+            norm_src_uri = src_uri
+            if localization:
+                norm_src_uri = _relative_to_locale(src_uri, localization)
+            i18n_info = self.i18n_infos[src_uri] = I18nFileInfo(
+                norm_src_uri, localization or self.default_language, localization
+            )
+        return i18n_info
+
+
+@lru_cache(maxsize=16)
+def get_locale_prefix_index(languages: Tuple[str, ...], default_language: str) -> LocalePrefixIndex:
+    return LocalePrefixIndex(languages, default_language)
+
+
+def _relative_to_locale(path: str, locale: str) -> Optional[str]:
+    """
+    Return the path relative to the given locale folder (like PurePath.relative_to)
+    or None if the path is not in that folder.
+    """
+    prefix, _, relative_path = path.partition("/")
+    if prefix != locale:
+        return None
+    return relative_path or "."
+
+
+def _join_locale(locale: str, path: str) -> str:
+    """
+    Return the path in the given locale folder (like PurePath(locale) / path).
+    """
+    if path == ".":
+        return locale
+    return f"{locale}/{path}"
+
+
 def create_i18n_file(
     file: File,
     current_language: str,
@@ -21,142 +99,123 @@ def create_i18n_file(
 ) -> File:
     log.debug(f"reconfigure {file}")
 
-    # create a new File instance that we can turn into an i18n file
-    file = File(
-        file.src_path,
-        config.docs_dir,
-        file.dest_path,
-        config.use_directory_urls,
-        dest_uri=file.dest_uri,
-        inclusion=file.inclusion,
-    )
-
-    file_dest_path = Path(file.dest_path)
-    file_locale = default_language
-    file_localization = None
-
-    for language in all_languages:
-        if is_relative_to(file.src_path, language):
-            file_locale = language
-            file_localization = language
-            break
-        else:
-            # maybe the language folder is present BUT not configured in the plugin.languages yet
-            # so we use the locale regex to guess that it's a localization folder
-            maybe_file_locale = PurePath(file.src_path).parts[0]
-            if RE_LOCALE.match(maybe_file_locale):
-                file_locale = maybe_file_locale
-                file_localization = maybe_file_locale
-                break
+    locale_prefix_index = get_locale_prefix_index(tuple(all_languages), default_language)
+    i18n_info = locale_prefix_index.get_i18n_info(file.src_uri)
+    file_locale = i18n_info.locale
 
     # README.html should be renamed to index.html
-    if file_dest_path.name.endswith("README.html"):
-        file_dest_path = file_dest_path.with_name("index.html")
+    dest_uri = file.dest_uri
+    file_dest_uri = dest_uri
+    if file_dest_uri.endswith("README.html"):
+        file_dest_uri = posixpath.join(posixpath.dirname(file_dest_uri), "index.html")
 
     if file_locale != current_language:
-        if is_relative_to(file_dest_path, file_locale):
+        relative_dest_uri = _relative_to_locale(file_dest_uri, file_locale)
+        if relative_dest_uri is not None:
             # we have to change the output folder
-            file.dest_path = PurePath(
-                PurePath(current_language) / PurePath(file_dest_path).relative_to(file_locale)
-            ).as_posix()
+            dest_uri = _join_locale(current_language, relative_dest_uri)
         elif current_language != default_language:
-            file.dest_path = PurePath(
-                PurePath(current_language) / PurePath(file_dest_path)
-            ).as_posix()
+            dest_uri = _join_locale(current_language, file_dest_uri)
     elif file_locale == default_language:
         # we check that we are relative since we also accept other non localized files (assets)
-        if is_relative_to(file_dest_path, file_locale):
+        relative_dest_uri = _relative_to_locale(file_dest_uri, file_locale)
+        if relative_dest_uri is not None:
             # we have to change the output folder to nothing
-            file.dest_path = PurePath(file_dest_path).relative_to(file_locale).as_posix()
-        elif current_language != default_language:
-            file.dest_path = PurePath(
-                PurePath(current_language) / PurePath(file_dest_path)
-            ).as_posix()
-    file.abs_dest_path = os.path.normpath(os.path.join(config.site_dir, file.dest_path))
+            dest_uri = relative_dest_uri
+
+    # create a new File instance that we can turn into an i18n file, its destination
+    # is relocated beforehand since older MkDocs compute the url when it is created
+    file = I18nFile(
+        file.src_path,
+        config.docs_dir,
+        config.site_dir,
+        config.use_directory_urls,
+        dest_uri=dest_uri,
+        inclusion=file.inclusion,
+    )
+    file.i18n_info = i18n_info
 
     # assure a valid name for the Page.is_index check
     if file.name == "README":
         file.name = "index"
 
-    # update the url in case we played with the folder structure
-    file.url = file._get_url(config.use_directory_urls)
-
     # save some i18n metadata
     # alternates should list themselves
-    file.alternates = {current_language: file}
-    file.locale = file_locale
-    file.locale_alternate_of = current_language
-    file.localization = file_localization
-
-    # compute the normalized (non localized) src_uri
-    file.norm_src_uri = file.src_uri
-    if file.localization:
-        file.norm_src_uri = PurePath(file.src_uri).relative_to(file.localization).as_posix()
+    file.alternates = I18nAlternates(locale_prefix_index.language_positions, current_language, file)
 
     log.debug(f"reconfigure {file} from locale {file_locale}")
 
     return file
 
 
-class I18nFiles(Files):
+class I18nFiles(BaseI18nFiles):
     """
     We need to override Files to handle the automagic discovery of resources allowing
     users to not specify their suffixed version of the resource (think image).
 
     Example: french page displaying image.fr.png can use [my french img](image.png)
 
-    This is made possible by overriding 'get_file_from_path' below.
+    This is made possible by the resolution of the expected src_uris below.
     """
 
-    def __init__(self, plugin, files: Files) -> None:
-        super().__init__(files)
-        self.plugin = plugin
+    def __init__(self, plugin, files: Iterable[File]) -> None:
+        self.locale_prefix_index = get_locale_prefix_index(
+            tuple(plugin.all_languages), plugin.default_language
+        )
+        super().__init__(plugin, files)
 
-    def get_file_from_path(self, path: str) -> Optional[File]:
-        """
-        Used by mkdocs.structure.nav.get_navigation to find resources linked in markdown.
-        """
-        expected_src_uri = PurePath(path)
-        if expected_src_uri == PurePath("."):
-            expected_src_uri = PurePath("index.md")
-
-        expected_src_uris: list[PurePath] = []
+    def get_expected_src_uris(self, src_uri: str) -> List[str]:
+        current_language = self.plugin.current_language
+        default_language = self.plugin.default_language
+        fallback_to_default = self.plugin.config.fallback_to_default is True
+        expected_locale = self.locale_prefix_index.get_locale(src_uri)
+        expected_src_uris = []
 
         # non localized paths detection (root)
-        if is_relative_to(expected_src_uri, self.plugin.current_language):
+        if expected_locale == current_language:
             # First add current_code/path
             # Second add default_code/path (fallback)
             # Last add path without prefix
-            resolved_path = expected_src_uri.relative_to(self.plugin.current_language)
-            expected_src_uris.append(expected_src_uri)
-            if self.plugin.config.fallback_to_default is True:
-                expected_src_uris.append(PurePath(self.plugin.default_language) / resolved_path)
+            resolved_path = _relative_to_locale(src_uri, current_language)
+            expected_src_uris.append(src_uri)
+            if fallback_to_default:
+                expected_src_uris.append(_join_locale(default_language, resolved_path))
             expected_src_uris.append(resolved_path)
-        elif is_relative_to(expected_src_uri, self.plugin.default_language):
+        elif expected_locale == default_language:
             # First add default_code/path
             # Second add current_code/path (fallback)
             # Last add path without prefix
-            resolved_path = expected_src_uri.relative_to(self.plugin.default_language)
-            expected_src_uris.append(expected_src_uri)
-            if self.plugin.config.fallback_to_default is True:
-                expected_src_uris.append(PurePath(self.plugin.current_language) / resolved_path)
+            resolved_path = _relative_to_locale(src_uri, default_language)
+            expected_src_uris.append(src_uri)
+            if fallback_to_default:
+                expected_src_uris.append(_join_locale(current_language, resolved_path))
             expected_src_uris.append(resolved_path)
         # localized paths detection
         else:
             # First add current_code/path
             # Second add default_code/path (fallback)
             # Last add path without modification
-            expected_src_uris.append(PurePath(self.plugin.current_language) / expected_src_uri)
-            if self.plugin.config.fallback_to_default is True:
-                expected_src_uris.append(PurePath(self.plugin.default_language) / expected_src_uri)
-            expected_src_uris.append(expected_src_uri)
-
-        for src_uri in expected_src_uris:
-            file = self.src_uris.get(src_uri.as_posix())
-            if file:
-                return file
-        else:
-            return None
+            expected_src_uris.append(_join_locale(current_language, src_uri))
+            if fallback_to_default:
+                expected_src_uris.append(_join_locale(default_language, src_uri))
+            expected_src_uris.append(src_uri)
+
+        return expected_src_uris
+
+    def get_requesting_src_uris(self, src_uri: str) -> List[str]:
+        requesting_src_uris = [src_uri]
+        for language in (self.plugin.current_language, self.plugin.default_language):
+            requesting_src_uris.append(_join_locale(language, src_uri))
+            resolved_path = _relative_to_locale(src_uri, language)
+            if resolved_path is not None:
+                requesting_src_uris.append(resolved_path)
+                requesting_src_uris.append(
+                    _join_locale(self.plugin.current_language, resolved_path)
+                )
+                requesting_src_uris.append(
+                    _join_locale(self.plugin.default_language, resolved_path)
+                )
+        return requesting_src_uris
 
 
 def reconfigure_navigation(i18n_plugin, nav):
@@ -0,0 +1,85 @@
+from types import MappingProxyType
+from typing import Any, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Tuple
+
+from mkdocs_static_i18n.config import I18nPluginLanguage
+from mkdocs_static_i18n.files import get_language_positions
+
+
+class LanguageRegistry(NamedTuple):
+    """
+    Lookups of the configured languages.
+
+    The registry is computed once when the plugin configuration is validated so that
+    the languages are never scanned again during the builds.
+    """
+
+    # every configured locale, in configuration order
+    all_languages: Tuple[str, ...]
+    all_languages_set: FrozenSet[str]
+    default_language: Optional[str]
+    # the locales to build, in configuration order
+    build_languages: Tuple[str, ...]
+    build_languages_set: FrozenSet[str]
+    # the built locales in the order their search entries are added to the search index
+    search_languages: Tuple[str, ...]
+    # the "<locale>/" prefixes of the locations of the built languages
+    build_prefixes: Tuple[str, ...]
+    # the position of each locale in the alternates of the i18n files
+    positions: Mapping[str, int]
+    configs: Mapping[str, I18nPluginLanguage]
+
+    @classmethod
+    def from_config(cls, languages: Iterable[I18nPluginLanguage]) -> "LanguageRegistry":
+        languages = list(languages)
+        all_languages = tuple(lang.locale for lang in languages)
+        default_language = next((lang.locale for lang in languages if lang.default is True), None)
+        build_languages = tuple(lang.locale for lang in languages if lang.build is True)
+        configs = {}
+        for lang in languages:
+            configs.setdefault(lang.locale, lang)
+        return cls(
+            all_languages=all_languages,
+            all_languages_set=frozenset(all_languages),
+            default_language=default_language,
+            build_languages=build_languages,
+            build_languages_set=frozenset(build_languages),
+            search_languages=(default_language,)
+            + tuple(locale for locale in build_languages if locale != default_language),
+            build_prefixes=tuple(f"{locale}/" for locale in build_languages),
+            positions=get_language_positions(all_languages),
+            configs=MappingProxyType(configs),
+        )
+
+    def get_language_config(self, locale: str) -> I18nPluginLanguage:
+        try:
+            return self.configs[locale]
+        except KeyError:
+            raise Exception(f"Could not find language locale '{locale}'") from None
+
+
+class ConfigOverlay(NamedTuple):
+    """
+    The values of the config and theme options overridden by a language.
+
+    Overlays are computed once per language and applied (then reverted) by swapping
+    the config values references: the original values are never mutated, only the
+    dicts leading to an overridden value are copied.
+    """
+
+    config: Mapping[str, Any]
+    theme: Mapping[str, Any]
+
+
+def merge_overrides(source: Optional[dict], overrides: dict) -> dict:
+    """
+    Return a copy of source recursively updated with the overrides, sharing the values
+    which are not overridden.
+    """
+    merged = dict(source or {})
+    for key, value in overrides.items():
+        if isinstance(value, dict) and value:
+            nested = merged.get(key)
+            merged[key] = merge_overrides(nested if isinstance(nested, dict) else None, value)
+        else:
+            merged[key] = value
+    return merged
@@ -0,0 +1,186 @@
+"""
+Build the non default languages in worker processes (see the 'parallel_builds' option).
+
+Workers are forked from the main build process so that each of them inherits its own
+copy of the MkDocs config and plugin state, which are not picklable. Only the results
+that the main process needs to finalize the build are sent back: the search entries,
+the sitemap alternates and the markdown cache counters of the language built by the
+worker.
+
+The files shared by every language build (think the theme assets or the 404.html page
+at the root of the site) are written to a staging directory of their language by the
+workers and moved to the site in the languages order once every language is built, so
+the site is the same as the one of a sequential build.
+
+The same number of workers is used to pre-build the search index of each language when
+the search plugin 'prebuild_index' option is combined with 'search_index_per_language'.
+"""
+
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from mkdocs import utils
+from mkdocs.plugins import get_plugin_logger
+from mkdocs.structure.files import File
+
+log = get_plugin_logger(__name__)
+
+# state inherited by the forked workers
+_worker_state = {}
+
+
+def can_fork() -> bool:
+    return "fork" in multiprocessing.get_all_start_methods()
+
+
+def sitemap_page(page):
+    """
+    Picklable copy of the Page attributes used by the sitemap.xml template.
+    """
+    if page is None:
+        return None
+    return SimpleNamespace(
+        abs_url=page.abs_url,
+        canonical_url=page.canonical_url,
+        is_link=getattr(page, "is_link", False),
+        update_date=getattr(page, "update_date", None),
+    )
+
+
+def sitemap_file(file: File, with_alternates=True):
+    """
+    Picklable copy of the File attributes used by the sitemap.xml template.
+    """
+    i18n_file = SimpleNamespace(url=file.url, page=sitemap_page(file.page))
+    if with_alternates:
+        i18n_file.alternates = {
+            locale: (
+                sitemap_file(alternate, with_alternates=False)
+                if alternate is not file
+                else i18n_file
+            )
+            for locale, alternate in file.alternates.items()
+        }
+    return i18n_file
+
+
+def _build_language(locale: str):
+    i18n_plugin = _worker_state["i18n_plugin"]
+    build_language = _worker_state["build_language"]
+    search_entries_offset = len(i18n_plugin.search_entries)
+    markdown_cache = i18n_plugin.markdown_cache
+    hits, misses = markdown_cache.counts if markdown_cache is not None else (0, 0)
+    site_dir = os.path.normpath(_worker_state["site_dir"])
+    locale_dir = os.path.join(site_dir, locale, "")
+    staging_dir = os.path.join(_worker_state["staging_dir"], locale)
+
+    def stage(output_path: str) -> str:
+        output_path = os.path.normpath(output_path)
+        if output_path.startswith(locale_dir) or not output_path.startswith(site_dir + os.sep):
+            return output_path
+        return os.path.join(staging_dir, os.path.relpath(output_path, site_dir))
+
+    # the MkDocs functions monkey patched below are restored for the next language
+    # built by this worker
+    write_file, copy_file = utils.write_file, utils.copy_file
+    utils.write_file = lambda content, output_path: write_file(content, stage(output_path))
+    utils.copy_file = lambda source_path, output_path: copy_file(source_path, stage(output_path))
+    try:
+        build_language(locale)
+    finally:
+        utils.write_file, utils.copy_file = write_file, copy_file
+    if markdown_cache is not None:
+        hits, misses = markdown_cache.hits - hits, markdown_cache.misses - misses
+    return (
+        locale,
+        i18n_plugin.search_entries[search_entries_offset:],
+        [sitemap_file(file) for file in i18n_plugin.i18n_files_per_language.get(locale, [])],
+        (hits, misses),
+    )
+
+
+def move_staged_files(staging_dir: str, site_dir: str):
+    """
+    Move the files written by a language build to its staging directory to the site.
+    """
+    for root, _, filenames in os.walk(staging_dir):
+        for filename in filenames:
+            staged_path = os.path.join(root, filename)
+            output_path = os.path.join(site_dir, os.path.relpath(staged_path, staging_dir))
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            shutil.move(staged_path, output_path)
+
+
+def build_languages(
+    i18n_plugin,
+    languages: List[str],
+    build_language: Callable[[str], None],
+    workers: int,
+    site_dir: str,
+):
+    """
+    Build the given languages using a pool of forked workers and merge their
+    search entries and sitemap alternates back into the i18n plugin.
+
+    The files shared by the language builds are then moved to the site_dir in the
+    languages order.
+    """
+    with tempfile.TemporaryDirectory(prefix="mkdocs-static-i18n-") as staging_dir:
+        _worker_state.update(
+            i18n_plugin=i18n_plugin,
+            build_language=build_language,
+            site_dir=site_dir,
+            staging_dir=staging_dir,
+        )
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("fork"),
+            ) as executor:
+                results = list(executor.map(_build_language, languages))
+        finally:
+            _worker_state.clear()
+
+        for locale in languages:
+            move_staged_files(os.path.join(staging_dir, locale), site_dir)
+
+    for locale, search_entries, sitemap_files, (hits, misses) in results:
+        i18n_plugin.search_entries.extend(search_entries)
+        i18n_plugin.i18n_files_per_language[locale] = sitemap_files
+        if i18n_plugin.markdown_cache is not None:
+            i18n_plugin.markdown_cache.hits += hits
+            i18n_plugin.markdown_cache.misses += misses
+
+
+def _prebuild_search_index(search_index_class, search_index_config: dict, entries: List[dict]):
+    search_index = search_index_class(**search_index_config)
+    search_index._entries = entries
+    return search_index.generate_search_index()
+
+
+def prebuild_search_indexes(
+    search_index, configs: Dict[str, dict], entries: Dict[str, List[dict]], workers: int
+) -> Dict[str, str]:
+    """
+    Generate the pre-built search index of each language using a pool of workers.
+
+    Each language search index is generated by a new instance of the search plugin
+    search index with the given configuration (think its lunr.js language).
+    """
+    locales = list(configs)
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("fork")
+    ) as executor:
+        search_indexes = executor.map(
+            _prebuild_search_index,
+            repeat(type(search_index)),
+            [configs[locale] for locale in locales],
+            [entries[locale] for locale in locales],
+        )
+        return dict(zip(locales, search_indexes))
@@ -1,5 +1,4 @@
 import logging
-import re
 import sys
 from pathlib import PurePath
 from typing import Optional
@@ -12,7 +11,10 @@ from mkdocs.plugins import get_plugin_logger
 from mkdocs.structure.files import Files
 from mkdocs.structure.pages import Page
 
-from mkdocs_static_i18n import folder
+from mkdocs_static_i18n import folder, is_relative_to, parallel
+from mkdocs_static_i18n.admonitions import AdmonitionTranslator
+from mkdocs_static_i18n.cache import MarkdownCache
+from mkdocs_static_i18n.catalog import I18nCatalog
 from mkdocs_static_i18n.reconfigure import ExtendedPlugin
 from mkdocs_static_i18n.utils import I18nLoggingFilter
 
@@ -39,6 +41,11 @@ class I18n(ExtendedPlugin):
         if self.current_language is None:
             self.current_language = self.default_language
 
+        if not self.building:
+            self.search_index_writes = 0
+            self.deferred_search_index_writes = 0
+            self.markdown_cache = self.get_markdown_cache(config)
+
         path_suffix = self.current_language if not self.is_default_language_build else ""
 
         log.info(
@@ -57,6 +64,15 @@ class I18n(ExtendedPlugin):
         # reconfigure the mkdocs config
         config = self.reconfigure_mkdocs_config(config)
 
+        # prepare the admonition translations of the pages of this language build
+        self.admonition_translator = AdmonitionTranslator(
+            admonition_translations, "pymdownx.details" in config["markdown_extensions"]
+        )
+        if self.markdown_cache is not None:
+            self.markdown_cache_context = MarkdownCache.get_context_digest(
+                self.current_language, admonition_translations, config["markdown_extensions"]
+            )
+
         # manually trigger with-pdf, to apply language specific overrides
         with_pdf_plugin = config.plugins.get("with-pdf")
         if with_pdf_plugin:
@@ -72,6 +88,14 @@ class I18n(ExtendedPlugin):
 
         Note that each file's alternates are also built during this step.
         """
+        # keep the docs_dir files listing of the first build so that the other
+        # languages builds reuse it instead of walking the docs_dir again
+        if not self.building:
+            self.docs_dir_files = [
+                file for file in files if is_relative_to(file.abs_src_path, config.docs_dir)
+            ]
+            self.i18n_catalog = I18nCatalog(self, self.docs_dir_files, config)
+
         i18n_files = self.reconfigure_files(files, config)
         # update the (cumulative) global alternates map which is
         # used by the sitemap.xml template
@@ -125,11 +149,22 @@ class I18n(ExtendedPlugin):
         if with_pdf_plugin:
             with_pdf_plugin.on_nav(i18n_nav, config, files)
 
+        # use the date of the source files as the sitemap <lastmod> of the pages
+        self.reconfigure_pages_lastmod(files)
+
+        # keep the navigation around to render the sitemap.xml ourselves
+        self.sitemap_nav = i18n_nav
+
         return i18n_nav
 
     def on_env(self, env, config, files):
         # Add extension to allow the "continue" clause in the sitemap template loops.
         env.add_extension(loopcontrols)
+        # keep the environment around to render the sitemap.xml ourselves
+        self.sitemap_env = env
+        self.sitemap_files = files
+        # the sitemap.xml is rendered once every language is built
+        self.defer_sitemap(config)
 
     @plugins.event_priority(50)
     def on_template_context(self, context, template_name, config):
@@ -153,46 +188,12 @@ class I18n(ExtendedPlugin):
 
         Here we translate admonition and details titles.
         """
-        admonition_translations = self.current_language_config.admonition_translations or {}
-
-        # Force lowercase keys for case insensitive matching
-        admonition_translations = {k.lower(): v for k, v in admonition_translations.items()}
-
-        marker = r"!{3}"  # Admonition marker
-        if "pymdownx.details" in config["markdown_extensions"]:
-            marker = r"(?:\?{3}\+?|!{3})"  # Admonition or Details marker
-
-        # Copied from https://github.com/Python-Markdown/markdown/blob/master/markdown/extensions/admonition.py and modified for a single-line processing
-        # Adapted to match the details extension as well
-        RE = re.compile(
-            r'^(?P<indent>[ \t]*)'  # leading spaces/tabs
-            r'(?P<marker>' + marker + r' ?)'  # marker (!!!, ???, ???+)
-            r'(?P<type>[\w\-]+(?: +[\w\-]+)*)'  # type (info, warning, etc.)
-            r'(?: +"(?P<title>.*?)")?'  # optional title in quotes
-            r' *$'  # optional trailing spaces/tabs
-        )
-
-        def handle_admonition_translations(line):
-            m = RE.match(line)
-            if m:
-                indent = m.group("indent")
-                marker = m.group("marker")
-                admonition_type = m.group("type")
-                title = m.group("title")
-                if (
-                    not title or title.strip() == ""
-                ) and admonition_type.lower() in admonition_translations:
-                    new_title = admonition_translations[admonition_type.lower()]
-                    line = f'{indent}{marker}{admonition_type} "{new_title}"'
-
-            return line
-
-        out = []
-        for line in markdown.splitlines():
-            line = handle_admonition_translations(line)
-            out.append(line)
-
-        markdown = "\n".join(out)
+        markdown, translated = self.translate_markdown(markdown)
+        if translated:
+            log.debug(
+                f"Translated {translated} admonition title{'s' if translated > 1 else ''} "
+                f"of page '{page.file.src_uri}' to '{self.current_language}'"
+            )
         return markdown
 
     @plugins.event_priority(50)
@@ -221,6 +222,13 @@ class I18n(ExtendedPlugin):
         with_pdf_plugin = config.plugins.get("with-pdf")
         if with_pdf_plugin:
             with_pdf_plugin.on_post_page(output, page, config)
+        # localized pages use the search index of their language
+        if (
+            self.config.search_index_per_language
+            and self.current_language != self.default_language
+            and any(name in ["search", "material/search"] for name in config.plugins)
+        ):
+            output = self.reconfigure_search_location(output, page, config)
         return output
 
     @plugins.event_priority(-100)
@@ -232,11 +240,21 @@ class I18n(ExtendedPlugin):
         # memorize locale search entries
         self.extend_search_entries(config)
 
+        # the sitemap.xml is rendered below once every language is built
+        self.restore_sitemap(config)
+
         if self.building:
             return
 
         self.building = True
 
+        from mkdocs import utils
+        from mkdocs.commands import build as mkdocs_build
+
+        # the MkDocs functions monkey patched below are restored in any case
+        mkdocs_utils_clean_directory = utils.clean_directory
+        mkdocs_build_get_files = mkdocs_build.get_files
+
         # Block time logging for internal builds and filter redundant MkDocs log
         build_logger = logging.getLogger("mkdocs.commands.build")
         i18n_filter = I18nLoggingFilter()
@@ -244,42 +262,81 @@ class I18n(ExtendedPlugin):
         i18n_filter.filtered_prefixes.add("Building documentation to directory")
         build_logger.addFilter(i18n_filter)
 
-        # manually trigger with-pdf, see #110
-        with_pdf_plugin = config.plugins.get("with-pdf")
-        if with_pdf_plugin:
-            with_pdf_output_path = with_pdf_plugin.config["output_path"]
-            with_pdf_plugin.on_post_build(config)
+        try:
+            # manually trigger with-pdf, see #110
+            with_pdf_plugin = config.plugins.get("with-pdf")
+            if with_pdf_plugin:
+                with_pdf_output_path = with_pdf_plugin.config["output_path"]
+                with_pdf_plugin.on_post_build(config)
 
-        # monkey patching mkdocs.utils.clean_directory to avoid
-        # the site_dir to be cleaned up on each build() call
-        from mkdocs import utils
+            # monkey patching mkdocs.utils.clean_directory to avoid
+            # the site_dir to be cleaned up on each build() call
+            utils.clean_directory = lambda x: x
 
-        mkdocs_utils_clean_directory = utils.clean_directory
-        utils.clean_directory = lambda x: x
+            # monkey patching mkdocs.commands.build.get_files to avoid
+            # the docs_dir to be walked again on each build() call
+            mkdocs_build.get_files = lambda config: Files(self.docs_dir_files)
 
-        for locale in self.build_languages:
-            if locale == self.current_language:
-                continue
-            self.current_language = locale
-            # TODO: reconfigure config here? skip on_config?
             dirty = True if "--dirty" in sys.argv or "--dirtyreload" in sys.argv else False
-            build(config, dirty=dirty)
 
-            # manually trigger with-pdf for this locale, see #110
-            if with_pdf_plugin:
-                with_pdf_plugin.config["output_path"] = PurePath(
-                    f"{locale}/{with_pdf_output_path}"
-                ).as_posix()
-                with_pdf_plugin.on_post_build(config)
+            def build_language(locale):
+                self.current_language = locale
+                # TODO: reconfigure config here? skip on_config?
+                build(config, dirty=dirty)
 
-        # rebuild and deduplicate the search index
-        self.reconfigure_search_index(config)
+                # manually trigger with-pdf for this locale, see #110
+                if with_pdf_plugin:
+                    with_pdf_plugin.config["output_path"] = PurePath(
+                        f"{locale}/{with_pdf_output_path}"
+                    ).as_posix()
+                    with_pdf_plugin.on_post_build(config)
 
-        # remove monkey patching in case some other builds are triggered
-        # on the same site (tests, ci...)
-        utils.clean_directory = mkdocs_utils_clean_directory
-
-        # Unblock time logging after internal builds
-        build_logger.removeFilter(i18n_filter)
+            languages = [
+                locale for locale in self.build_languages if locale != self.current_language
+            ]
+            workers = min(self.config.parallel_builds, len(languages))
+            if workers and not parallel.can_fork():
+                log.warning(
+                    "parallel_builds is not supported on this platform, building sequentially"
+                )
+                workers = 0
+            if workers:
+                log.info(f"Building {len(languages)} languages using {workers} parallel workers")
+                parallel.build_languages(self, languages, build_language, workers, config.site_dir)
+            else:
+                for locale in languages:
+                    build_language(locale)
+
+            # render the sitemap.xml with the alternates of every built language
+            self.reconfigure_sitemap(config)
+
+            # rebuild and deduplicate the search index
+            self.reconfigure_search_index(config)
+            log.debug(
+                f"Search index written {self.search_index_writes} time(s), "
+                f"{self.deferred_search_index_writes} language build write(s) deferred"
+            )
 
-        self.building = False
+            # report the markdown cache usage of every language build
+            if self.markdown_cache is not None:
+                evicted = self.markdown_cache.evict()
+                log.info(
+                    f"Markdown cache: {self.markdown_cache.hits} hit(s), "
+                    f"{self.markdown_cache.misses} miss(es), {evicted} evicted entries"
+                )
+        finally:
+            # remove monkey patching and the state of this build even when a language
+            # build failed, in case some other builds are triggered on the same site
+            # (mkdocs serve, tests, ci...)
+            utils.clean_directory = mkdocs_utils_clean_directory
+            mkdocs_build.get_files = mkdocs_build_get_files
+            if self.search_entries_spool is not None:
+                self.search_entries_spool.cleanup()
+                self.search_entries_spool = None
+            self.docs_dir_files = None
+            self.i18n_catalog = None
+
+            # Unblock time logging after internal builds
+            build_logger.removeFilter(i18n_filter)
+
+            self.building = False
@@ -1,10 +1,18 @@
+import json
+import os
+import re
+import time
 from collections import defaultdict
-from copy import deepcopy
+from copy import copy, deepcopy
+from functools import partial
 from pathlib import Path, PurePath
-from typing import Union
+from types import MappingProxyType
+from typing import Optional, Tuple, Union
 from urllib.parse import urlsplit
 
-from mkdocs import localization
+from jinja2 import TemplateNotFound
+from mkdocs import localization, utils
+from mkdocs.commands.build import _build_theme_template
 from mkdocs.config.base import LegacyConfig
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.plugins import BasePlugin, get_plugin_logger
@@ -14,8 +22,19 @@ from mkdocs.structure.pages import Page
 from mkdocs.theme import Theme
 
 from mkdocs_static_i18n import __file__ as installation_path
-from mkdocs_static_i18n import folder, is_relative_to, suffix
+from mkdocs_static_i18n import folder, is_relative_to, parallel, suffix
+from mkdocs_static_i18n.cache import MarkdownCache
+from mkdocs_static_i18n.catalog import I18nCatalog
 from mkdocs_static_i18n.config import I18nPluginConfig
+from mkdocs_static_i18n.files import I18nAlternates, I18nFile
+from mkdocs_static_i18n.languages import ConfigOverlay, LanguageRegistry, merge_overrides
+from mkdocs_static_i18n.search import (
+    SearchEntriesSpool,
+    iter_compact_entries,
+    iter_deduplicated_entries,
+    write_search_index,
+)
+from mkdocs_static_i18n.sitemap import write_sitemap, write_sitemap_index
 
 log = get_plugin_logger(__name__)
 
@@ -77,46 +96,87 @@ except Exception:
     log.warning("Unable to detect lunr languages from mkdocs distribution")
 MKDOCS_THEMES = ["mkdocs", "readthedocs"]
 
+# i18n aware version of the sitemap.xml template
+CUSTOM_I18N_SITEMAP_DIR = (Path(installation_path).parent / "custom_i18n_sitemap").resolve()
+
+# expands the texts references of the compact search index in the MkDocs search worker
+COMPACT_SEARCH_INDEX_LOADER = (
+    Path(installation_path).parent / "custom_i18n_search" / "compact_search_index.js"
+)
+
+# redirects the search index requests of the material theme to the page language one
+SEARCH_INDEX_LOCATION_LOADER = (
+    (Path(installation_path).parent / "custom_i18n_search" / "search_index_location.js")
+    .read_text(encoding="utf-8")
+    .rstrip()
+)
+
+# material bundle script, the search index location loader must run before it
+RE_MATERIAL_BUNDLE_SCRIPT = re.compile(r'<script src="[^"]*assets/javascripts/bundle\.[^"]*"')
+
 
 class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
+        self.admonition_translator = None
+        self.language_registry = LanguageRegistry.from_config([])
         self.building = False
         self.current_language = None
+        self.docs_dir_files = None
         self.extra_alternate = {}
+        self.i18n_catalog = None
         self.i18n_files_per_language = {}
+        self.markdown_cache = None
+        self.markdown_cache_context = None
+        self.config_overlays = {}
         self.original_configs = {}
         self.original_theme_configs = {}
         self.search_entries = []
+        self.search_entries_spool = None
+        self.search_index_writes = 0
+        self.deferred_search_index_writes = 0
+        self.sitemap_deferred = False
+        self.sitemap_env = None
+        self.sitemap_files = None
+        self.sitemap_nav = None
+
+    def load_config(self, options, config_file_path=None):
+        errors, warnings = super().load_config(options, config_file_path)
+        # the languages are looked up from the registry once they are validated
+        if not errors:
+            self.language_registry = LanguageRegistry.from_config(self.config.languages)
+        return errors, warnings
 
+    # the public languages attributes stay lists: they are exposed to the user templates
     @property
     def all_languages(self):
-        return [lang.locale for lang in self.config.languages]
+        return list(self.language_registry.all_languages)
 
     @property
     def default_language(self):
-        for lang_config in self.config.languages:
-            if lang_config.default is True:
-                return lang_config.locale
+        return self.language_registry.default_language
 
     @property
     def current_language_config(self):
-        return self.get_language_config(self.current_language)
+        return self.language_registry.get_language_config(self.current_language)
 
     @property
     def is_default_language_build(self):
-        return self.current_language == self.default_language
+        return self.current_language == self.language_registry.default_language
 
     @property
     def build_languages(self):
-        return [
-            lang.locale for lang in filter(lambda lang: lang.build is True, self.config.languages)
-        ]
+        return list(self.language_registry.build_languages)
+
+    @property
+    def search_languages(self):
+        """
+        Built languages in the order their search entries are added to the search index.
+        """
+        return self.language_registry.search_languages
 
     def get_language_config(self, locale):
-        for lang_config in filter(lambda lang: lang.locale == locale, self.config.languages):
-            return lang_config
-        raise Exception(f"Could not find language locale '{locale}'")
+        return self.language_registry.get_language_config(locale)
 
     def reconfigure_mkdocs_config(self, config: MkDocsConfig) -> MkDocsConfig:
         # MkDocs themes specific reconfiguration
@@ -143,6 +203,8 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
         for name, plugin in config.plugins.items():
             # search plugin (MkDocs & material > 9.0) reconfiguration
             if name in ["search", "material/search"]:
+                # the search index is written once every language is built
+                self.defer_search_index_write(config, plugin)
                 # search plugin reconfiguration can be disabled
                 if self.config.reconfigure_search:
                     config = self.reconfigure_search_plugin(config, name, plugin)
@@ -154,10 +216,7 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
 
         # Install a i18n aware version of sitemap.xml if not provided by the user
         if not Path(PurePath(config.theme.custom_dir or ".") / PurePath("sitemap.xml")).exists():
-            custom_i18n_sitemap_dir = Path(
-                PurePath(installation_path).parent / PurePath("custom_i18n_sitemap")
-            ).resolve()
-            config.theme.dirs.insert(0, str(custom_i18n_sitemap_dir))
+            config.theme.dirs.insert(0, str(CUSTOM_I18N_SITEMAP_DIR))
 
         return config
 
@@ -183,18 +242,36 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
         return config
 
     def save_original_config(self, store, key, value):
+        # overlays never mutate the original values so they are kept by reference
         if key not in store:
-            store[key] = deepcopy(value)
+            store[key] = value
 
     def apply_user_overrides(self, config: MkDocsConfig):
         """
         The i18n configuration structure allows users to set arbitrary configuration
         that will be overridden if they match valid MkDocsConfig or Theme options.
+
+        The overrides of each language are computed once as an overlay which is
+        applied by swapping the overridden config values.
         """
         # reset config to its original values since the config might have been
         # altered by a previous build
         config = self.reset_to_original_config(config)
 
+        overlay = self.config_overlays.get(self.current_language)
+        if overlay is None:
+            overlay = self.get_config_overlay(config)
+            self.config_overlays[self.current_language] = overlay
+        for config_key, config_value in overlay.config.items():
+            config[config_key] = config_value
+        for config_key, config_value in overlay.theme.items():
+            config.theme[config_key] = config_value
+        return config
+
+    def get_config_overlay(self, config: MkDocsConfig) -> ConfigOverlay:
+        """
+        Compute the overlay of the current language overrides from the original config.
+        """
         # some config overrides are forbidden as they make no sense
         forbidden_config_overrides = [
             "dev_addr",
@@ -220,6 +297,8 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
             "validation",
             "watch",
         ]
+        config_overrides = {}
+        theme_overrides = {}
         for lang_key, lang_override in self.current_language_config.items():
             if lang_key in forbidden_config_overrides:
                 log.warning(
@@ -230,12 +309,12 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
                 mkdocs_config_option_type = type(config.data[lang_key])
                 # support special Theme object overrides
                 if mkdocs_config_option_type == Theme and isinstance(lang_override, dict):
-                    config.theme = self.apply_user_theme_overrides(config.theme, lang_override)
+                    theme_overrides.update(self.get_theme_overlay(config.theme, lang_override))
                 elif mkdocs_config_option_type in [str, bool, dict, list, type(None)]:
                     self.save_original_config(
                         self.original_configs, lang_key, config.data[lang_key]
                     )
-                    config.load_dict({lang_key: lang_override})
+                    config_overrides[lang_key] = lang_override
                     log.info(
                         f"Overriding '{self.current_language}' config '{lang_key}' with '{lang_override}'"
                     )
@@ -244,28 +323,22 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
                     self.save_original_config(
                         self.original_configs, lang_key, config.data[lang_key]
                     )
-                    config[lang_key].update(lang_override)
+                    # shallow copy, the values which are not overridden are shared
+                    legacy_config = copy(config.data[lang_key])
+                    legacy_config.update(lang_override)
+                    config_overrides[lang_key] = legacy_config
                     log.info(
                         f"Updating '{self.current_language}' config '{lang_key}' with '{lang_override}'"
                     )
                 else:
                     log.warning(f"Unknown '{self.current_language}' config override '{lang_key}'")
-        return config
+        return ConfigOverlay(MappingProxyType(config_overrides), MappingProxyType(theme_overrides))
 
-    def apply_user_theme_overrides(self, theme: Theme, options: dict) -> Theme:
+    def get_theme_overlay(self, theme: Theme, options: dict) -> dict:
         """
-        Support and apply special mkdocs.Theme object overrides.
+        Support special mkdocs.Theme object overrides.
         """
-
-        def dict_recursive_update(source, overrides):
-            for key, value in overrides.items():
-                if isinstance(value, dict) and value:
-                    updated = dict_recursive_update(source.get(key, {}), value)
-                    source[key] = updated
-                else:
-                    source[key] = overrides[key]
-            return source
-
+        theme_overrides = {}
         for key, value in options.items():
             if key in theme and type(theme[key]) is type(value):
                 self.save_original_config(self.original_theme_configs, key, theme[key])
@@ -273,24 +346,26 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
                     f"Overriding '{self.current_language}' config 'theme.{key}' with '{value}'"
                 )
                 if isinstance(value, dict):
-                    dict_recursive_update(theme[key], value)
+                    theme_overrides[key] = merge_overrides(theme[key], value)
                 elif isinstance(value, list):
+                    items = list(theme[key])
                     for idx, item in enumerate(value):
                         if isinstance(item, dict):
-                            dict_recursive_update(theme[key][idx], item)
+                            items[idx] = merge_overrides(items[idx], item)
                         else:
-                            theme[key][idx] = item
+                            items[idx] = item
+                    theme_overrides[key] = items
                 else:
-                    theme[key] = value
+                    theme_overrides[key] = value
             elif key == "locale":
                 self.save_original_config(self.original_theme_configs, key, theme[key])
-                theme[key] = localization.parse_locale(value)
+                theme_overrides[key] = localization.parse_locale(value)
                 log.info(
                     f"Overriding '{self.current_language}' config 'theme.{key}' with '{value}'"
                 )
             else:
                 log.warning(f"Unknown '{self.current_language}' config override 'theme.{key}'")
-        return theme
+        return theme_overrides
 
     def reconfigure_mkdocs_theme(self, config: MkDocsConfig, locale: str) -> Theme:
         # set theme locale
@@ -302,7 +377,7 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
         if "language" in config.theme:
             config.theme["language"] = locale
         # configure extra.alternate language switcher
-        if len(self.build_languages) > 1 or "null" in self.all_languages:
+        if len(self.build_languages) > 1 or "null" in self.language_registry.all_languages_set:
             # 'on_page_context' overrides the config.extra.alternate
             # so we need to reset it to its initial computed value if present
             if self.extra_alternate:
@@ -374,6 +449,36 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
             search_plugin.config.lang = search_langs
         return config
 
+    def defer_search_index_write(self, config: MkDocsConfig, search_plugin):
+        """
+        Intercept the post_build event of the search plugin so that the partial search
+        index of each language build is not serialized and written for nothing: the
+        complete search index is written once by reconfigure_search_index.
+        """
+        post_build_events = config.plugins.events["post_build"]
+        for position, method in enumerate(post_build_events):
+            if getattr(method, "__self__", None) is search_plugin:
+                break
+        else:
+            # not registered or already intercepted
+            return
+
+        def on_post_build(**kwargs):
+            self.deferred_search_index_writes += 1
+            log.debug(f"Deferring the search index write of the '{self.current_language}' build")
+
+        post_build_events[position] = on_post_build
+        event_origins = getattr(config.plugins, "_event_origins", {})
+        if method in event_origins:
+            event_origins[on_post_build] = event_origins[method]
+
+    def run_search_post_build(self, config: MkDocsConfig, search_plugin):
+        """
+        Run the search plugin post_build event to write its search index.
+        """
+        self.search_index_writes += 1
+        search_plugin.on_post_build(config=config)
+
     def reconfigure_with_pdf_plugin(self, config: MkDocsConfig):
         """
         Support plugin mkdocs-with-pdf, see #110.
@@ -402,20 +507,24 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
         """
         # nav_translations
         nav_translations = self.current_language_config.nav_translations or {}
+        homepage_urls = {*nav_helper.expected_homepage_urls, ""}
 
-        for item in nav:
+        # walk the navigation items depth first without recursion
+        items = list(reversed(list(nav)))
+        while items:
+            item = items.pop()
             if hasattr(item, "title") and item.title in nav_translations:
                 item.title = nav_translations[item.title]
                 nav_helper.translated_items += 1
 
             # is that the localized content homepage?
             if nav_helper.homepage is None and isinstance(item, Page):
-                if item.url in nav_helper.expected_homepage_urls or item.url == "":
+                if item.url in homepage_urls:
                     nav_helper.homepage = item
 
             # translation should be recursive to children
             if hasattr(item, "children") and item.children:
-                self.reconfigure_navigation(item.children, config, files, nav_helper)
+                items.extend(reversed(item.children))
 
         return nav
 
@@ -450,7 +559,16 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
                     for entries_attr in ["entries", "_entries"]:
                         if hasattr(plugin.search_index, entries_attr):
                             entries = getattr(plugin.search_index, entries_attr)
-                            self.search_entries.extend(entries)
+                            if self.config.stream_search_entries:
+                                if self.search_entries_spool is None:
+                                    self.search_entries_spool = SearchEntriesSpool()
+                                self.search_entries_spool.write(self.current_language, entries)
+                                # the search index write of the language builds is deferred
+                                # to the end of the build which reads the spooled entries,
+                                # free the entries of the search plugin meanwhile
+                                entries.clear()
+                            else:
+                                self.search_entries.extend(entries)
                             break
                     else:
                         log.warning(f"Could not find '{name}' plugin search entries")
@@ -462,35 +580,38 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
         would pollute the search results.
         When this happens, we favor the default language location if its
         content is the same as its /language counterpart.
+
+        The /language entries are indexed by their title and text so that only the
+        location of a few candidates is checked for each default language entry, and
+        the duplicates are dropped in a single pass over the search index entries.
         """
-        default_lang_entries = filter(
-            lambda x: not x["location"].startswith(
-                tuple([f"{lang}/" for lang in self.build_languages])
-            ),
-            search_index_entries,
-        )
-        target_lang_entries = list(
-            filter(
-                lambda x: x["location"].startswith(
-                    tuple([f"{lang}/" for lang in self.build_languages])
-                ),
-                search_index_entries,
-            )
-        )
+        lang_prefixes = self.language_registry.build_prefixes
+        default_lang_entries = []
+        target_lang_entries = defaultdict(list)
+        for entry in search_index_entries:
+            if entry["location"].startswith(lang_prefixes):
+                target_lang_entries[(entry["title"], entry["text"])].append(entry)
+            else:
+                default_lang_entries.append(entry)
+
+        duplicated_entries = set()
         for default_lang_entry in default_lang_entries:
-            duplicated_entries = filter(
-                lambda x: x["title"] == default_lang_entry["title"]
-                and x["location"].endswith(default_lang_entry["location"])
-                and x["text"] == default_lang_entry["text"],
-                target_lang_entries,
-            )
-            for duplicated_entry in duplicated_entries:
-                log.debug(
-                    f"removed duplicated search entry: {duplicated_entry['title']} "
-                    f"{duplicated_entry['location']}"
-                )
-                search_index_entries.remove(duplicated_entry)
-                target_lang_entries.remove(duplicated_entry)
+            for target_lang_entry in target_lang_entries.get(
+                (default_lang_entry["title"], default_lang_entry["text"]), ()
+            ):
+                if id(target_lang_entry) not in duplicated_entries and target_lang_entry[
+                    "location"
+                ].endswith(default_lang_entry["location"]):
+                    log.debug(
+                        f"removed duplicated search entry: {target_lang_entry['title']} "
+                        f"{target_lang_entry['location']}"
+                    )
+                    duplicated_entries.add(id(target_lang_entry))
+
+        if duplicated_entries:
+            search_index_entries[:] = [
+                entry for entry in search_index_entries if id(entry) not in duplicated_entries
+            ]
 
     def reconfigure_search_index(self, config: MkDocsConfig):
         """
@@ -508,15 +629,346 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
                     log.warning(
                         f"Can't access the search index entries in {name} ({attribute_name})."
                     )
+                    # write the search index as is since its write was deferred
+                    self.run_search_post_build(config, plugin)
                     return
+                compact = self.use_compact_search_index(config, plugin)
+                # write one search index per language
+                if self.config.search_index_per_language:
+                    self.reconfigure_search_index_per_language(
+                        config, plugin, search_index_entries, compact
+                    )
+                    continue
                 # clear and repopulate the search index
                 search_index_entries.clear()
-                search_index_entries.extend(self.search_entries)
+                if self.search_entries_spool is not None:
+                    if self.write_streamed_search_index(config, plugin, compact):
+                        continue
+                    search_index_entries.extend(self.iter_spooled_search_entries())
+                else:
+                    search_index_entries.extend(self.search_entries)
                 # remove search index duplicates
                 if self.config.reconfigure_search:
                     self.reconfigure_search_duplicates(search_index_entries)
+                # share the identical texts of the search index entries
+                if compact:
+                    search_index_entries[:] = list(
+                        iter_compact_entries(partial(iter, search_index_entries))
+                    )
                 # run the post_build event to rebuild the search index
-                plugin.on_post_build(config=config)
+                self.run_search_post_build(config, plugin)
+
+    def reconfigure_search_index_per_language(
+        self, config: MkDocsConfig, search_plugin, search_index_entries, compact: bool = False
+    ):
+        """
+        Write the search index of every built language to its own directory using only
+        the language's own entries and lunr.js language: the default language index
+        goes to search/search_index.json and the others to <locale>/search/search_index.json.
+
+        The locations of the entries stay relative to the site directory so that the
+        localized pages only need to load another search index, see reconfigure_search_location.
+        """
+        site_dir = config.site_dir
+        search_plugin_lang = search_plugin.config.lang
+        search_index_lang = search_plugin.search_index.config.get("lang")
+        search_langs = {
+            locale: [locale] if locale in LUNR_LANGUAGES else search_plugin_lang
+            for locale in self.build_languages
+        }
+
+        entries_per_language = self.iter_search_entries_per_language()
+        prebuilt_search_indexes = {}
+        workers = min(self.config.parallel_builds, len(self.build_languages))
+        if workers and search_plugin.config.get("prebuild_index") and parallel.can_fork():
+            entries_per_language = list(entries_per_language)
+            log.info(
+                f"Pre-building {len(entries_per_language)} search indexes "
+                f"using {workers} parallel workers"
+            )
+            prebuilt_search_indexes = parallel.prebuild_search_indexes(
+                search_plugin.search_index,
+                {
+                    locale: {**search_plugin.search_index.config, "lang": search_langs[locale]}
+                    for locale, _ in entries_per_language
+                },
+                dict(entries_per_language),
+                workers,
+            )
+
+        try:
+            for locale, entries in entries_per_language:
+                if locale != self.default_language:
+                    config.site_dir = os.path.join(site_dir, locale)
+                search_plugin.config.lang = search_langs[locale]
+                search_plugin.search_index.config["lang"] = search_langs[locale]
+                search_index_entries[:] = (
+                    list(iter_compact_entries(partial(iter, entries))) if compact else entries
+                )
+                # the search index of the language is pre-built already, reuse it
+                if locale in prebuilt_search_indexes:
+                    search_plugin.search_index.generate_search_index = partial(
+                        prebuilt_search_indexes.pop, locale
+                    )
+                # run the post_build event to build the language search index
+                self.run_search_post_build(config, search_plugin)
+                if locale != self.default_language:
+                    self.copy_search_static_files(site_dir, config.site_dir)
+        finally:
+            config.site_dir = site_dir
+            search_plugin.config.lang = search_plugin_lang
+            search_plugin.search_index.config["lang"] = search_index_lang
+            search_plugin.search_index.__dict__.pop("generate_search_index", None)
+
+    def iter_search_entries_per_language(self):
+        """
+        Yield the search entries of each built language.
+
+        Spooled search entries are read one language at a time.
+        """
+        if self.search_entries_spool is not None:
+            for locale in self.search_languages:
+                yield locale, list(self.search_entries_spool.read(locale))
+            return
+
+        entries_per_language = {locale: [] for locale in self.build_languages}
+        for entry in self.search_entries:
+            locale, sep, _ = entry["location"].partition("/")
+            if sep and locale != self.default_language and locale in entries_per_language:
+                entries_per_language[locale].append(entry)
+            else:
+                entries_per_language[self.default_language].append(entry)
+        yield from entries_per_language.items()
+
+    def iter_spooled_search_entries(self):
+        for locale in self.search_languages:
+            yield from self.search_entries_spool.read(locale)
+
+    def write_streamed_search_index(
+        self, config: MkDocsConfig, search_plugin, compact: bool = False
+    ) -> bool:
+        """
+        Write the search index from the spooled search entries one entry at a time
+        (deduplicating them on the fly) instead of loading them in the search plugin.
+
+        Return False when the search index can't be streamed (pre-built indexes,
+        dirty reloads) so that it is built by the search plugin itself.
+        """
+        if getattr(search_plugin, "is_dirty", False) or search_plugin.config.get("prebuild_index"):
+            return False
+        # run the post_build event on an empty search index for its side effects (think
+        # lunr.js language support files) and to get the search index configuration
+        self.run_search_post_build(config, search_plugin)
+        path = os.path.join(config.site_dir, "search", "search_index.json")
+        with open(path, encoding="utf-8") as f:
+            empty_search_index = f.read()
+        get_entries = self.iter_spooled_search_entries
+        if self.config.reconfigure_search:
+            get_entries = partial(
+                iter_deduplicated_entries,
+                self.iter_spooled_search_entries,
+                self.language_registry.build_prefixes,
+            )
+        entries = iter_compact_entries(get_entries) if compact else get_entries()
+        return write_search_index(
+            path,
+            empty_search_index,
+            entries,
+            # the mkdocs search plugin sorts the keys of its search index
+            sort_keys=hasattr(search_plugin.search_index, "_entries"),
+        )
+
+    def use_compact_search_index(self, config: MkDocsConfig, search_plugin) -> bool:
+        """
+        Check if the search index can use the compact format and install its loader in
+        the search worker of the theme.
+
+        The compact format is only supported by the search worker of the MkDocs search
+        plugin and can't be used with pre-built search indexes.
+        """
+        if not self.config.compact_search_index:
+            return False
+        worker_path = os.path.join(config.site_dir, "search", "worker.js")
+        if not hasattr(search_plugin.search_index, "_entries") or not os.path.isfile(worker_path):
+            log.warning("compact_search_index is only supported by the MkDocs search plugin")
+            return False
+        if search_plugin.config.get("prebuild_index"):
+            log.warning("compact_search_index is not supported by pre-built search indexes")
+            return False
+        with open(COMPACT_SEARCH_INDEX_LOADER, encoding="utf-8") as f:
+            loader = f.read()
+        with open(worker_path, "r+", encoding="utf-8") as f:
+            if loader not in f.read():
+                f.write(loader)
+        return True
+
+    def copy_search_static_files(self, site_dir: str, locale_site_dir: str):
+        """
+        Copy the search scripts of the theme (think worker.js) next to the localized
+        search index. The search index and the lunr.js language support files are
+        written by the search plugin itself.
+
+        The copied search/main.js of the MkDocs themes starts the localized worker.js.
+        """
+        search_dir = os.path.join(site_dir, "search")
+        if not os.path.isdir(search_dir):
+            return
+        for filename in os.listdir(search_dir):
+            if filename == "search_index.json" or filename == "tinyseg.js":
+                continue
+            if filename.startswith("lunr.") and filename != "lunr.js":
+                continue
+            from_path = os.path.join(search_dir, filename)
+            to_path = os.path.join(locale_site_dir, "search", filename)
+            if not os.path.isfile(from_path) or os.path.exists(to_path):
+                continue
+            if filename != "main.js":
+                utils.copy_file(from_path, to_path)
+                continue
+            with open(from_path, encoding="utf-8") as f:
+                main_js = f.read()
+            if '"search/worker.js"' not in main_js:
+                log.warning(f"Could not localize the search worker of '{to_path}'")
+            locale_worker = PurePath(locale_site_dir).relative_to(site_dir) / "search/worker.js"
+            utils.write_file(
+                main_js.replace('"search/worker.js"', json.dumps(locale_worker.as_posix())).encode(
+                    "utf-8"
+                ),
+                to_path,
+            )
+
+    def reconfigure_search_location(self, output: str, page: Page, config: MkDocsConfig) -> str:
+        """
+        Point the search javascript of a localized page to its language search index
+        without changing the base url used by the rest of the theme javascript.
+
+        The MkDocs themes load the localized search/main.js (starting the localized
+        worker.js) and the material theme redirects its search index requests.
+        """
+        if "material/search" in config.plugins:
+            base_url = utils.get_relative_url(".", page.url)
+            loader = (
+                f"<script>{SEARCH_INDEX_LOCATION_LOADER}({json.dumps(f'{base_url}/search/search_index.json')}, "
+                f"{json.dumps(f'{base_url}/{self.current_language}/search/search_index.json')})"
+                "</script>\n"
+            )
+            return RE_MATERIAL_BUNDLE_SCRIPT.sub(lambda m: loader + m.group(0), output, count=1)
+        main_js = utils.get_relative_url("search/main.js", page.url)
+        locale_main_js = utils.get_relative_url(f"{self.current_language}/search/main.js", page.url)
+        return output.replace(f'src="{main_js}"', f'src="{locale_main_js}"')
+
+    def defer_sitemap(self, config: MkDocsConfig):
+        """
+        Remove the sitemap.xml from the templates rendered by each language build: it is
+        rendered once by reconfigure_sitemap when every language is built.
+        """
+        if "sitemap.xml" in config.theme.static_templates:
+            config.theme.static_templates.discard("sitemap.xml")
+            self.sitemap_deferred = True
+
+    def restore_sitemap(self, config: MkDocsConfig):
+        """
+        Restore the sitemap.xml in the templates of the theme at the end of each language
+        build, otherwise the next build would copy the template as a static file.
+        """
+        if self.sitemap_deferred:
+            config.theme.static_templates.add("sitemap.xml")
+
+    def is_i18n_sitemap_template(self, template) -> bool:
+        return template is not None and Path(template.filename).parent == CUSTOM_I18N_SITEMAP_DIR
+
+    def reconfigure_sitemap(self, config: MkDocsConfig):
+        """
+        Render the sitemap.xml template once using the alternates of every built language.
+        """
+        if not self.sitemap_deferred:
+            return
+        self.sitemap_deferred = False
+        if self.sitemap_env is None:
+            return
+        start = time.monotonic()
+        try:
+            template = self.sitemap_env.get_template("sitemap.xml")
+        except TemplateNotFound:
+            template = None
+        # our own sitemap.xml template is written natively, users ones are rendered
+        if not self.is_i18n_sitemap_template(template):
+            if self.config.sitemap_index:
+                log.warning("sitemap_index is not supported by custom sitemap.xml templates")
+            _build_theme_template(
+                "sitemap.xml", self.sitemap_env, self.sitemap_files, config, self.sitemap_nav
+            )
+        elif self.config.sitemap_index and config.site_url:
+            sitemaps = write_sitemap_index(
+                config.site_dir,
+                self.i18n_files_per_language,
+                config.site_url,
+                self.config.sitemap_max_urls,
+            )
+            log.info(f"Wrote {len(sitemaps)} sitemaps listed by the sitemap_index.xml")
+        else:
+            if self.config.sitemap_index:
+                # the sitemap protocol requires absolute sitemap locations
+                log.warning("sitemap_index requires the 'site_url' option, writing a sitemap.xml")
+            pages = [f.page for f in self.sitemap_files.documentation_pages() if f.page is not None]
+            try:
+                timestamp = utils.get_build_timestamp(pages=pages)
+            except TypeError:
+                # MkDocs < 1.6
+                timestamp = utils.get_build_timestamp()
+            write_sitemap(
+                os.path.join(config.site_dir, "sitemap.xml"),
+                self.i18n_files_per_language,
+                config.site_url,
+                timestamp,
+            )
+        log.info(
+            f"Rendered the sitemap of {len(self.i18n_files_per_language)} languages "
+            f"in {time.monotonic() - start:.2f} seconds"
+        )
+
+    def get_markdown_cache(self, config: MkDocsConfig) -> Optional[MarkdownCache]:
+        """
+        Return the markdown cache of the whole i18n build if the 'markdown_cache_dir'
+        option is set (relative to the mkdocs.yml directory).
+        """
+        if not self.config.markdown_cache_dir:
+            return None
+        directory = self.config.markdown_cache_dir
+        if config.config_file_path:
+            directory = os.path.join(os.path.dirname(config.config_file_path), directory)
+        return MarkdownCache(directory, self.config.markdown_cache_max_size * 1024 * 1024)
+
+    def translate_markdown(self, markdown: str) -> Tuple[str, int]:
+        """
+        Apply the markdown transforms of the current language build, reusing their result
+        from the markdown cache for the pages which were already transformed.
+        """
+        translator = self.admonition_translator
+        if self.markdown_cache is None or not translator.needs_translation(markdown):
+            return translator.translate(markdown)
+        key = self.markdown_cache.get_key(self.markdown_cache_context, markdown)
+        result = self.markdown_cache.get(key)
+        if result is None:
+            result = translator.translate(markdown)
+            self.markdown_cache.set(key, *result)
+        return result
+
+    def reconfigure_pages_lastmod(self, files: Files):
+        """
+        Set the update_date of the pages (rendered as their sitemap <lastmod>) to the last
+        modification date of their source file. Fallback pages get the date of the default
+        language file they are built from.
+        """
+        if self.config.sitemap_lastmod == "build" or self.i18n_catalog is None:
+            return
+        lastmod_dates = self.i18n_catalog.get_lastmod_dates()
+        for file in files.documentation_pages():
+            if file.page is None or not isinstance(file, I18nFile):
+                continue
+            update_date = lastmod_dates.get(file.norm_src_uri, {}).get(file.locale)
+            if update_date is not None:
+                file.page.update_date = update_date
 
     def reconfigure_files(
         self,
@@ -525,115 +977,89 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
     ) -> Union[suffix.I18nFiles, folder.I18nFiles]:
         """ """
         if self.config.docs_structure == "suffix":
-            create_i18n_file = suffix.create_i18n_file
             I18nFiles = suffix.I18nFiles
         else:
-            create_i18n_file = folder.create_i18n_file
             I18nFiles = folder.I18nFiles
+        if self.i18n_catalog is None:
+            self.i18n_catalog = I18nCatalog(self, [], mkdocs_config)
+        catalog = self.i18n_catalog
         i18n_src_uris = {}
-        i18n_files = I18nFiles(self, [])
-        i18n_alternate_src_uris = defaultdict(list)
+        i18n_files = []
         for file in files:
+            source = catalog.get_source(file)
             # user provided files in docs_dir
-            if is_relative_to(file.abs_src_path, mkdocs_config.docs_dir):
-                i18n_file = create_i18n_file(
-                    file,
-                    self.current_language,
-                    self.default_language,
-                    self.all_languages,
-                    mkdocs_config,
-                )
+            if source is None and is_relative_to(file.abs_src_path, mkdocs_config.docs_dir):
+                source = catalog.add(file)
 
+            if source is not None:
                 # user provided documentation page
-                if i18n_file.is_documentation_page():
+                if file.is_documentation_page():
                     # never seen that file?
-                    if i18n_file.norm_src_uri not in i18n_src_uris:
+                    if source.norm_src_uri not in i18n_src_uris:
                         # best case scenario
                         # use the file since its locale is our current build language
-                        if i18n_file.locale == self.current_language:
-                            i18n_src_uris[i18n_file.norm_src_uri] = i18n_file
-                            log.debug(
-                                f"Use {i18n_file.locale} {i18n_file.localization} {i18n_file}"
-                            )
+                        if source.locale == self.current_language:
+                            i18n_src_uris[source.norm_src_uri] = source
+                            log.debug(f"Use {source.locale} {source.localization} {file}")
                         # if locale is the default language AND default language fallback is enabled
                         # we are using a file that is not really our locale
                         elif (
                             self.config.fallback_to_default is True
-                            and i18n_file.locale == self.default_language
+                            and source.locale == self.default_language
                         ):
-                            i18n_src_uris[i18n_file.norm_src_uri] = i18n_file
-                            log.debug(
-                                f"Use default {i18n_file.locale} {i18n_file.localization} {i18n_file}"
-                            )
-                            i18n_alternate_src_uris[i18n_file.norm_src_uri].append(file)
+                            i18n_src_uris[source.norm_src_uri] = source
+                            log.debug(f"Use default {source.locale} {source.localization} {file}")
                         else:
-                            log.debug(
-                                f"Ignore {i18n_file.locale} {i18n_file.localization} {i18n_file}"
-                            )
-                            i18n_alternate_src_uris[i18n_file.norm_src_uri].append(file)
+                            log.debug(f"Ignore {source.locale} {source.localization} {file}")
 
                     # we've seen that file already
                     else:
                         # override it only if this is our language
-                        if i18n_file.locale == self.current_language:
+                        if source.locale == self.current_language:
                             # users should not add default non suffixed/folder files + suffixed/folder
                             # files when multiple languages are configured
                             if (
                                 len(self.build_languages) > 1
-                                and i18n_file.localization is not None
-                                and i18n_src_uris[i18n_file.norm_src_uri].locale == i18n_file.locale
+                                and source.localization is not None
+                                and i18n_src_uris[source.norm_src_uri].locale == source.locale
                             ):
                                 raise Exception(
                                     f"Conflicting files for the default language '{self.default_language}': "
-                                    f"choose either '{i18n_file.norm_src_uri}' or "
-                                    f"'{i18n_src_uris[i18n_file.norm_src_uri].src_uri}' but not both"
+                                    f"choose either '{source.norm_src_uri}' or "
+                                    f"'{i18n_src_uris[source.norm_src_uri].file.src_uri}' but not both"
                                 )
-                            i18n_src_uris[i18n_file.norm_src_uri] = i18n_file
-                            log.debug(
-                                f"Use localized {i18n_file.locale} {i18n_file.localization} {i18n_file}"
-                            )
+                            i18n_src_uris[source.norm_src_uri] = source
+                            log.debug(f"Use localized {source.locale} {source.localization} {file}")
                         else:
-                            log.debug(
-                                f"Ignore {i18n_file.locale} {i18n_file.localization} {i18n_file}"
-                            )
-                            i18n_alternate_src_uris[i18n_file.norm_src_uri].append(file)
+                            log.debug(f"Ignore {source.locale} {source.localization} {file}")
 
                 # user provided asset
                 else:
                     # never seen that file?
-                    if i18n_file.norm_src_uri not in i18n_src_uris:
+                    if source.norm_src_uri not in i18n_src_uris:
                         # best case scenario
                         # use the file since its locale is our current build language
-                        if i18n_file.locale == self.current_language:
-                            i18n_src_uris[i18n_file.norm_src_uri] = i18n_file
-                            log.debug(
-                                f"Use asset {i18n_file.locale} {i18n_file.localization} {i18n_file}"
-                            )
+                        if source.locale == self.current_language:
+                            i18n_src_uris[source.norm_src_uri] = source
+                            log.debug(f"Use asset {source.locale} {source.localization} {file}")
                         # if locale is the default language AND default language fallback is enabled
                         # we are using a file that is not really our locale
                         elif (
                             self.config.fallback_to_default is True
-                            and i18n_file.locale == self.default_language
+                            and source.locale == self.default_language
                         ):
-                            i18n_asset = create_i18n_file(
-                                file,
-                                self.default_language,
-                                self.default_language,
-                                self.all_languages,
-                                mkdocs_config,
-                            )
-                            i18n_src_uris[i18n_file.norm_src_uri] = i18n_asset
+                            i18n_src_uris[source.norm_src_uri] = source
                             log.debug(
-                                f"Use asset default {i18n_asset.locale} {i18n_file.localization} {i18n_asset}"
+                                f"Use asset default {source.locale} {source.localization} {file}"
                             )
 
                     # we've seen that file already
                     else:
                         # override it only if this is our language
-                        if i18n_file.localization == self.current_language:
-                            i18n_src_uris[i18n_file.norm_src_uri] = i18n_file
+                        if source.localization == self.current_language:
+                            i18n_src_uris[source.norm_src_uri] = source
                             log.debug(
-                                f"Use asset localized {i18n_file.locale} {i18n_file.localization} {i18n_file}"
+                                f"Use asset localized {source.locale} {source.localization} {file}"
                             )
 
             # theme (and overrides) files
@@ -644,67 +1070,34 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
 
         # populate the resulting Files and keep track of all the alternates
         # that will be used by the sitemap.xml template
-        for file in i18n_src_uris.values():
-            if "index" in file.src_uri:
-                log.debug(f"Selected {file.locale} {file.localization} {file}")
-            i18n_files.append(file)
+        i18n_norm_src_uris = {}
+        for norm_src_uri, source in i18n_src_uris.items():
+            # default language assets are used as is by the other languages
+            if source.file.is_documentation_page() or source.locale == self.current_language:
+                build_language = self.current_language
+            else:
+                build_language = self.default_language
+            i18n_file = catalog.get_i18n_file(source.file, build_language)
+            if "index" in i18n_file.src_uri:
+                log.debug(f"Selected {i18n_file.locale} {i18n_file.localization} {i18n_file}")
+            i18n_norm_src_uris[norm_src_uri] = i18n_file
+            i18n_files.append(i18n_file)
 
         # build the alternates for all the Files
-        self.reconfigure_files_alternates(
-            i18n_src_uris, i18n_alternate_src_uris, mkdocs_config, create_i18n_file
-        )
+        self.reconfigure_files_alternates(i18n_norm_src_uris, catalog)
 
-        return i18n_files
+        return I18nFiles(self, i18n_files)
 
-    def reconfigure_files_alternates(
-        self,
-        i18n_src_uris,
-        i18n_alternate_src_uris,
-        mkdocs_config: MkDocsConfig,
-        create_i18n_file: Union[suffix.create_i18n_file, folder.create_i18n_file],
-    ):
+    def reconfigure_files_alternates(self, i18n_src_uris, catalog: I18nCatalog):
         """
         Find and update the alternates of each file.
         """
-        for build_lang in sorted(self.build_languages):
-            for i18n_src_uri, i18n_file in i18n_src_uris.items():
+        for i18n_src_uri, i18n_file in i18n_src_uris.items():
+            for build_lang in catalog.get_alternate_files(i18n_src_uri):
                 if build_lang not in i18n_file.alternates:
-                    for alternate_file in i18n_alternate_src_uris.get(i18n_src_uri, []):
-                        alternate_file = create_i18n_file(
-                            alternate_file,
-                            build_lang,
-                            self.default_language,
-                            self.all_languages,
-                            mkdocs_config,
-                        )
-                        if alternate_file.locale == build_lang:
-                            i18n_file.alternates[alternate_file.locale] = alternate_file
-                            break
-                    else:
-                        # if fallbacking to default language is configured and we did not find
-                        # an alternate for the build language, look for the default version of the file
-                        if self.config.fallback_to_default is True:
-                            for alternate_file in i18n_alternate_src_uris.get(i18n_src_uri, []):
-                                alternate_file = create_i18n_file(
-                                    alternate_file,
-                                    build_lang,
-                                    self.default_language,
-                                    self.all_languages,
-                                    mkdocs_config,
-                                )
-                                if alternate_file.locale == self.default_language:
-                                    i18n_file.alternates[build_lang] = alternate_file
-                                    break
-                            else:
-                                alternate_file = create_i18n_file(
-                                    i18n_file,
-                                    build_lang,
-                                    self.default_language,
-                                    self.all_languages,
-                                    mkdocs_config,
-                                )
-                                if alternate_file.locale == self.default_language:
-                                    i18n_file.alternates[build_lang] = alternate_file
+                    i18n_file.alternates[build_lang] = catalog.get_alternate(
+                        i18n_src_uri, build_lang
+                    )
         # uncomment to debug alternate selection
         # for i18n_src_uri, i18n_file in i18n_src_uris.items():
         #     print(" ")
@@ -727,7 +1120,7 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
             create_i18n_file = folder.create_i18n_file
 
         i18n_src_uris = {}
-        i18n_alternate_src_uris = defaultdict(list)
+        i18n_alternate_files = []
 
         # at this point, the files have been cleaned up contrary to the
         # initial on_files run so it's harder to build the alternates
@@ -743,7 +1136,7 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
                 )
                 # used to rebuild blog alternates for the sitemap.xml and language switcher
                 i18n_src_uris[i18n_file.norm_src_uri] = file
-                i18n_alternate_src_uris[i18n_file.norm_src_uri].append(
+                i18n_alternate_files.append(
                     File(
                         file.src_path,
                         mkdocs_config.docs_dir,
@@ -755,11 +1148,17 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
                 )
                 # override blog related file specific properties in place
                 file.abs_dest_path = i18n_file.abs_dest_path
-                file.alternates = {self.current_language: file}
+                file.alternates = I18nAlternates(
+                    i18n_file.alternates.positions, self.current_language, file
+                )
                 file.dest_uri = i18n_file.dest_uri
-                file.locale = i18n_file.locale
-                file.locale_alternate_of = self.current_language
-                file.norm_src_uri = i18n_file.norm_src_uri
+                if isinstance(file, I18nFile):
+                    file.i18n_info = i18n_file.i18n_info
+                else:
+                    # files generated by the blog plugin
+                    file.locale = i18n_file.locale
+                    file.locale_alternate_of = self.current_language
+                    file.norm_src_uri = i18n_file.norm_src_uri
                 file.url = i18n_file._get_url(mkdocs_config.use_directory_urls)
                 #
                 if file.page:
@@ -770,7 +1169,7 @@ class ExtendedPlugin(BasePlugin[I18nPluginConfig]):
         # have been filtered out and new ones got generated by the blog plugin,
         # we can't get the complete view of the alternates
         self.reconfigure_files_alternates(
-            i18n_src_uris, i18n_alternate_src_uris, mkdocs_config, create_i18n_file
+            i18n_src_uris, I18nCatalog(self, i18n_alternate_files, mkdocs_config)
         )
 
         # update the per-language files store for template alternates
@@ -0,0 +1,141 @@
+"""
+Stream the search entries of the built languages (see the 'stream_search_entries' option).
+
+The search entries of each language build are spooled to a temporary newline delimited
+JSON file right after the language is built instead of being kept in memory until every
+language is built. The deduplication and the final search index are then produced from
+those files one entry at a time so that only one language entries are held in memory.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Callable, Dict, Iterable, Iterator, Set
+
+from mkdocs.plugins import get_plugin_logger
+
+log = get_plugin_logger(__name__)
+
+
+class SearchEntriesSpool:
+    """
+    Temporary newline delimited JSON files of the search entries of each language.
+
+    Parallel builds workers are forked after the spool is created so they write the
+    entries of the language they build to the same directory.
+    """
+
+    def __init__(self) -> None:
+        self.directory = tempfile.mkdtemp(prefix="mkdocs_static_i18n_search_")
+
+    def get_path(self, locale: str) -> str:
+        return os.path.join(self.directory, f"{locale}.ndjson")
+
+    def write(self, locale: str, entries: Iterable[dict]) -> None:
+        with open(self.get_path(locale), "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, default=str))
+                f.write("\n")
+
+    def read(self, locale: str) -> Iterator[dict]:
+        try:
+            with open(self.get_path(locale), encoding="utf-8") as f:
+                for line in f:
+                    yield json.loads(line)
+        except FileNotFoundError:
+            return
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def get_entry_digest(entry: dict) -> bytes:
+    """
+    Fixed size digest of the title and text of a search entry.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(entry["title"].encode("utf-8"))
+    digest.update(b"\0")
+    digest.update(entry["text"].encode("utf-8"))
+    return digest.digest()
+
+
+def get_text_digest(entry: dict) -> bytes:
+    """
+    Fixed size digest of the text of a search entry.
+    """
+    return hashlib.blake2b(entry["text"].encode("utf-8"), digest_size=16).digest()
+
+
+def iter_deduplicated_entries(
+    get_entries: Callable[[], Iterable[dict]], lang_prefixes: tuple
+) -> Iterator[dict]:
+    """
+    Yield the search entries without the /language entries duplicating a default
+    language entry (same title and text, location ending with the default location).
+
+    The entries are read twice: once to index the locations of the default language
+    entries by the digest of their title and text, then to filter the /language entries.
+    """
+    default_locations: Dict[bytes, Set[str]] = {}
+    for entry in get_entries():
+        if not entry["location"].startswith(lang_prefixes):
+            default_locations.setdefault(get_entry_digest(entry), set()).add(entry["location"])
+
+    for entry in get_entries():
+        if entry["location"].startswith(lang_prefixes):
+            locations = default_locations.get(get_entry_digest(entry), ())
+            if any(entry["location"].endswith(location) for location in locations):
+                log.debug(f"removed duplicated search entry: {entry['title']} {entry['location']}")
+                continue
+        yield entry
+
+
+def iter_compact_entries(get_entries: Callable[[], Iterable[dict]]) -> Iterator[dict]:
+    """
+    Yield the search entries of a compact search index: the entries having the same text
+    as a previous entry reference the position of that entry (text_ref) instead of
+    repeating its text (think the fallback pages of every language).
+
+    The entries are read twice: once to find the position of the first entry of each
+    text, then to replace the texts of the other entries by their reference.
+    """
+    text_positions: Dict[bytes, int] = {}
+    for position, entry in enumerate(get_entries()):
+        if entry["text"]:
+            text_positions.setdefault(get_text_digest(entry), position)
+
+    for position, entry in enumerate(get_entries()):
+        if entry["text"]:
+            text_position = text_positions[get_text_digest(entry)]
+            if text_position != position:
+                entry = {key: value for key, value in entry.items() if key != "text"}
+                entry["text_ref"] = text_position
+        yield entry
+
+
+def write_search_index(
+    path: str, empty_search_index: str, entries: Iterable[dict], sort_keys: bool
+) -> bool:
+    """
+    Write a search index from the search index generated without entries by the search
+    plugin, serializing the entries one at a time.
+
+    Return False if the search index does not end with its entries (like pre-built
+    indexes) and can't be streamed.
+    """
+    suffix = '"docs":[]}'
+    if not empty_search_index.endswith(suffix):
+        return False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(empty_search_index[: -len(suffix)])
+        f.write('"docs":[')
+        separator = ""
+        for entry in entries:
+            f.write(separator)
+            f.write(json.dumps(entry, sort_keys=sort_keys, separators=(",", ":"), default=str))
+            separator = ","
+        f.write("]}")
+    return True
@@ -0,0 +1,241 @@
+"""
+Write the i18n sitemap.xml without rendering the custom_i18n_sitemap/sitemap.xml template.
+
+The <url> elements are streamed to the sitemap.xml (and its gzipped version) one at a
+time and produce the exact same output as the template which is still used when users
+provide their own sitemap.xml template.
+
+Large sites can split their sitemap in sitemaps of each language (and of at most a given
+number of urls) listed by a sitemap_index.xml (see the 'sitemap_index' option).
+
+The <lastmod> of the pages can be the last modification date of their source file,
+computed for every source file at once (see the 'sitemap_lastmod' option).
+"""
+
+import gzip
+import os
+import subprocess
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from markupsafe import escape
+from mkdocs.plugins import get_plugin_logger
+from mkdocs.structure.files import File
+
+log = get_plugin_logger(__name__)
+
+SITEMAP_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+    'xmlns:xhtml="http://www.w3.org/1999/xhtml">'
+)
+SITEMAP_FOOTER = "\n</urlset>"
+
+SITEMAP_INDEX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+)
+SITEMAP_INDEX_FOOTER = "\n</sitemapindex>"
+
+# sitemap protocol limit of the size of a sitemap
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+
+def get_page_href(file: File, site_url: Optional[str]) -> str:
+    page = file.page
+    if page.canonical_url:
+        return escape(page.canonical_url)
+    if page.abs_url:
+        return escape(page.abs_url)
+    return f"{site_url}{file.url}"
+
+
+def get_alternate_href(file: File, site_url: Optional[str]) -> str:
+    page = file.page
+    if page is not None:
+        if getattr(page, "canonical_url", None):
+            return escape(page.canonical_url)
+        if getattr(page, "abs_url", None):
+            return escape(page.abs_url)
+    if file.url == "./":
+        return f"{site_url}"
+    return f"{site_url}{file.url}"
+
+
+def iter_sitemap(
+    i18n_files_per_language: Dict[str, List[File]], site_url: Optional[str]
+) -> Iterator[str]:
+    """
+    Yield the sitemap.xml one <url> element at a time.
+    """
+    alternate_hrefs = {}
+    yield SITEMAP_HEADER
+    for i18n_files in i18n_files_per_language.values():
+        yield from iter_url_elements(i18n_files, site_url, alternate_hrefs)
+    yield SITEMAP_FOOTER
+
+
+def iter_url_elements(
+    i18n_files: Iterable[File], site_url: Optional[str], alternate_hrefs: Dict[int, str]
+) -> Iterator[str]:
+    """
+    Yield the <url> element of each page of the given files.
+
+    The href of the alternates are computed once per alternate (and kept in the given
+    alternate_hrefs) as they are shared by the pages of every language.
+    """
+    for file in i18n_files:
+        page = file.page
+        if not page or getattr(page, "is_link", False):
+            continue
+        parts = [f"\n    <url>\n        <loc>{get_page_href(file, site_url)}</loc>"]
+        update_date = getattr(page, "update_date", None)
+        if update_date:
+            parts.append(f"\n        <lastmod>{update_date}</lastmod>")
+        parts.append("\n        <changefreq>daily</changefreq>")
+        for locale, alternate in file.alternates.items():
+            href = alternate_hrefs.get(id(alternate))
+            if href is None:
+                href = alternate_hrefs[id(alternate)] = get_alternate_href(alternate, site_url)
+            parts.append(
+                f'\n        <xhtml:link rel="alternate" hreflang="{locale}" href="{href}"/>'
+            )
+        parts.append("\n    </url>")
+        yield "".join(parts)
+
+
+def write_sitemap(
+    path: str,
+    i18n_files_per_language: Dict[str, List[File]],
+    site_url: Optional[str],
+    timestamp: int,
+) -> None:
+    """
+    Stream the sitemap.xml and its gzipped version (like MkDocs does) to disk.
+    """
+    gz_path = f"{path}.gz"
+    with open(path, "wb") as f, gzip.GzipFile(gz_path, mode="wb", mtime=timestamp) as gz_buf:
+        for chunk in iter_sitemap(i18n_files_per_language, site_url):
+            data = chunk.encode("utf-8")
+            f.write(data)
+            gz_buf.write(data)
+
+
+def write_language_sitemaps(
+    site_dir: str, locale: str, url_elements: Iterable[str], max_urls: int
+) -> List[str]:
+    """
+    Stream the <url> elements of a language to sitemap-<locale>.xml, starting a new
+    sitemap-<locale>-<n>.xml each time max_urls urls or the sitemap protocol maximum
+    size is reached.
+
+    Return the file names of the written sitemaps.
+    """
+    header = SITEMAP_HEADER.encode("utf-8")
+    footer = SITEMAP_FOOTER.encode("utf-8")
+    names = []
+    url_elements = (url_element.encode("utf-8") for url_element in url_elements)
+    data = next(url_elements, None)
+    while data is not None:
+        names.append(f"sitemap-{locale}-{len(names) + 1}.xml" if names else f"sitemap-{locale}.xml")
+        with open(os.path.join(site_dir, names[-1]), "wb") as f:
+            f.write(header)
+            urls, size = 0, len(header) + len(footer)
+            while data is not None:
+                # the sitemap is full, a sitemap holds at least one url whatever its size
+                if urls and (urls == max_urls or size + len(data) > SITEMAP_MAX_BYTES):
+                    break
+                f.write(data)
+                urls += 1
+                size += len(data)
+                data = next(url_elements, None)
+            f.write(footer)
+    return names
+
+
+def write_sitemap_index(
+    site_dir: str,
+    i18n_files_per_language: Dict[str, List[File]],
+    site_url: str,
+    max_urls: int,
+) -> List[str]:
+    """
+    Stream the sitemaps of each language and write the sitemap_index.xml listing them.
+
+    Return the file names of the written sitemaps.
+    """
+    sitemaps = []
+    alternate_hrefs = {}
+    for locale, i18n_files in i18n_files_per_language.items():
+        url_elements = iter_url_elements(i18n_files, site_url, alternate_hrefs)
+        sitemaps.extend(write_language_sitemaps(site_dir, locale, url_elements, max_urls))
+
+    with open(os.path.join(site_dir, "sitemap_index.xml"), "wb") as f:
+        f.write(SITEMAP_INDEX_HEADER.encode("utf-8"))
+        for name in sitemaps:
+            loc = escape(f"{site_url}{name}")
+            f.write(f"\n    <sitemap>\n        <loc>{loc}</loc>\n    </sitemap>".encode())
+        f.write(SITEMAP_INDEX_FOOTER.encode("utf-8"))
+    return sitemaps
+
+
+def format_lastmod(timestamp: float) -> str:
+    """
+    Format a timestamp like the update_date of the MkDocs pages.
+    """
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def get_mtime_timestamps(files: Iterable[File]) -> Dict[str, float]:
+    """
+    Return the modification time of the source file of the given files by src_uri.
+    """
+    timestamps = {}
+    for file in files:
+        try:
+            timestamps[file.src_uri] = os.stat(file.abs_src_path).st_mtime
+        except (OSError, TypeError):
+            continue
+    return timestamps
+
+
+def get_git_timestamps(docs_dir: str) -> Optional[Dict[str, float]]:
+    """
+    Return the date of the last commit of every file of the docs_dir by src_uri, parsed
+    from a single git log instead of running git once per file.
+
+    Return None if the docs_dir history could not be read.
+    """
+    try:
+        output = subprocess.run(
+            [
+                "git",
+                "-c",
+                "core.quotePath=false",
+                "log",
+                "--format=%x00%ct",
+                "--name-only",
+                "--relative",
+                "--",
+                ".",
+            ],
+            cwd=docs_dir,
+            capture_output=True,
+            check=True,
+            text=True,
+            encoding="utf-8",
+        ).stdout
+    except (OSError, subprocess.CalledProcessError) as e:
+        log.warning(
+            f"Could not read the git history of the docs_dir, using the files modification time: {e}"
+        )
+        return None
+    timestamps = {}
+    timestamp = None
+    # the commits are listed from the most recent one
+    for line in output.splitlines():
+        if line.startswith("\0"):
+            timestamp = float(line[1:])
+        elif line and timestamp is not None:
+            timestamps.setdefault(line, timestamp)
+    return timestamps
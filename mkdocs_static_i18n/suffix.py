@@ -1,17 +1,143 @@
 import os
-from pathlib import Path, PurePath
-from typing import Optional
-from urllib.parse import quote as urlquote
+import posixpath
+import sys
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 from mkdocs.config.defaults import MkDocsConfig
 from mkdocs.plugins import get_plugin_logger
-from mkdocs.structure.files import File, Files
+from mkdocs.structure.files import File
 
 from mkdocs_static_i18n.config import RE_LOCALE
+from mkdocs_static_i18n.files import (
+    BaseI18nFiles,
+    I18nAlternates,
+    I18nFile,
+    I18nFileInfo,
+    get_language_positions,
+)
 
 log = get_plugin_logger(__name__)
 
 
+def _split_suffix(name: str) -> Tuple[str, str]:
+    """
+    Split a file name into its stem and suffix like PurePath.stem and PurePath.suffix.
+    """
+    i = name.rfind(".")
+    if 0 < i < len(name) - 1:
+        return name[:i], name[i:]
+    return name, ""
+
+
+class SuffixClassification(NamedTuple):
+    """
+    Classification of a file, independent of the language being built.
+    """
+
+    i18n_info: I18nFileInfo
+    name: str
+    dest_uri: str
+
+
+class LocaleClassifier:
+    """
+    Classify the files of the suffix docs structure by their locale suffix.
+
+    The locale is extracted with plain string operations (RE_LOCALE is only matched
+    for locales which are not configured) and the classification of each file is
+    memoized so that it is computed only once for all the languages builds.
+    """
+
+    def __init__(
+        self, languages: Tuple[str, ...], default_language: str, use_directory_urls: bool
+    ) -> None:
+        self.languages = {language: language for language in languages}
+        self.default_language = default_language
+        self.use_directory_urls = use_directory_urls
+        self.language_positions = get_language_positions(languages)
+        # (src_uri, dest_uri) -> SuffixClassification
+        self.classifications: Dict[Tuple[str, str], SuffixClassification] = {}
+        # (norm_src_uri, localization) -> I18nFileInfo
+        self.i18n_infos: Dict[Tuple[str, Optional[str]], I18nFileInfo] = {}
+
+    def get_locale(self, name: str) -> Optional[str]:
+        """
+        Return the locale suffix of a file name, if any.
+        """
+        # same as PurePath(name).suffixes[-1]
+        if name.endswith(".") or "." not in name.lstrip("."):
+            return None
+        file_locale = name.rpartition(".")[2]
+        # the file_locale must be a valid language locale code that we check on the
+        # configured languages (validated by config) or using the locale regex in case
+        # users have localized files but not configured them on the plugin.languages yet
+        if file_locale in self.languages:
+            return self.languages[file_locale]
+        if RE_LOCALE.match(file_locale):
+            return sys.intern(file_locale)
+        return None
+
+    def get_i18n_info(self, norm_src_uri: str, localization: Optional[str]) -> I18nFileInfo:
+        key = (norm_src_uri, localization)
+        i18n_info = self.i18n_infos.get(key)
+        if i18n_info is None:
+            i18n_info = self.i18n_infos[key] = I18nFileInfo(
+                norm_src_uri, localization or self.default_language, localization
+            )
+        return i18n_info
+
+    def classify(self, file: File) -> SuffixClassification:
+        key = (file.src_uri, file.dest_uri)
+        classification = self.classifications.get(key)
+        if classification is None:
+            classification = self.classifications[key] = self._classify(file)
+        return classification
+
+    def _classify(self, file: File) -> SuffixClassification:
+        name = file.name
+        norm_src_uri = file.src_uri
+        dest_parent, dest_name = posixpath.split(file.dest_uri)
+        file_localization = self.get_locale(name)
+
+        if file_localization:
+            # file name suffixed by locale, remove it
+            name = name.rpartition(".")[0]
+            norm_src_uri = file.src_uri.replace(f".{file_localization}", "", 1)
+            dest_stem, dest_suffix = _split_suffix(dest_name)
+            dest_name = _split_suffix(dest_stem)[0] + dest_suffix
+            if self.use_directory_urls and dest_parent:
+                dest_grandparent, dest_parent_name = posixpath.split(dest_parent)
+                dest_parent_name = _split_suffix(dest_parent_name)[0]
+                # named index.lang.md get transformed to index.lang.md/index.md
+                # so we need to remove that named folder
+                if dest_parent_name in ["index", "README"]:
+                    dest_parent = dest_grandparent
+                else:
+                    dest_parent = posixpath.join(dest_grandparent, dest_parent_name)
+
+        # README.html should be renamed to index.html
+        if dest_name.endswith("README.html"):
+            dest_name = "index.html"
+
+        # assure a valid name for the Page.is_index check
+        if name == "README":
+            name = "index"
+
+        return SuffixClassification(
+            self.get_i18n_info(norm_src_uri, file_localization),
+            name,
+            posixpath.join(dest_parent, dest_name),
+        )
+
+
+@lru_cache(maxsize=16)
+def get_locale_classifier(
+    languages: Tuple[str, ...], default_language: str, use_directory_urls: bool
+) -> LocaleClassifier:
+    return LocaleClassifier(languages, default_language, use_directory_urls)
+
+
 def create_i18n_file(
     file: File,
     current_language: str,
@@ -21,121 +147,67 @@ def create_i18n_file(
 ) -> File:
     log.debug(f"reconfigure {file}")
 
-    # create a new File instance that we can turn into an i18n file
-    file = File(
+    classifier = get_locale_classifier(
+        tuple(all_languages), default_language, config.use_directory_urls
+    )
+    classification = classifier.classify(file)
+
+    dest_uri = classification.dest_uri
+    if current_language != default_language:
+        dest_uri = f"{current_language}/{dest_uri}"
+
+    # create a new File instance that we can turn into an i18n file, its url
+    # is computed from its dest_uri when first accessed
+    file = I18nFile(
         file.src_path,
         config.docs_dir,
-        file.dest_path,
+        config.site_dir,
         config.use_directory_urls,
-        dest_uri=file.dest_uri,
+        dest_uri=dest_uri,
         inclusion=file.inclusion,
     )
-
-    file_dest_path = Path(file.dest_path)
-    file_locale = default_language
-    file_localization = None
-    locale_site_dir = current_language if current_language != default_language else ""
-
-    try:
-        file_locale = Path(file.name).suffixes.pop(-1).replace(".", "")
-        # the file_locale must be a valid language locale code that we check on the
-        # configured languages (validated by config) or using the locale regex in case
-        # users have localized files but not configured them on the plugin.languages yet
-        if file_locale in all_languages or RE_LOCALE.match(file_locale):
-            file_dest_path_no_suffix = Path(file_dest_path.parent) / Path(
-                file_dest_path.stem
-            ).with_suffix("")
-            file_dest_path = Path(f"{file_dest_path_no_suffix}{file_dest_path.suffix}")
-            # file name suffixed by locale, remove it
-            file.name = Path(file.name).stem
-            # store file localization
-            file_localization = file_locale
-        else:
-            file_locale = default_language
-    except IndexError:
-        pass
-
-    if config.use_directory_urls and file_localization:
-        if file_dest_path.parent != Path("."):
-            parent_dest_path_no_suffix = file_dest_path.parent.with_suffix("")
-            file_dest_path = parent_dest_path_no_suffix / file_dest_path.name
-            # named index.lang.md get transformed to index.lang.md/index.md
-            # so we need to remove that named folder
-            if file_dest_path.parent.name in ["index", "README"]:
-                file_dest_path = file_dest_path.parent.parent / file_dest_path.name
-
-    # README.html should be renamed to index.html
-    if file_dest_path.name.endswith("README.html"):
-        file_dest_path = file_dest_path.with_name("index.html")
-
-    if locale_site_dir:
-        file.dest_path = Path(locale_site_dir) / file_dest_path
-    else:
-        file.dest_path = file_dest_path
-    file.abs_dest_path = os.path.normpath(os.path.join(config.site_dir, file.dest_path))
-
-    # assure a valid name for the Page.is_index check
-    if file.name == "README":
-        file.name = "index"
-
-    # update the url in case we played with the folder structure
-    file.url = file._get_url(config.use_directory_urls)
-
-    # fix the url
-    if locale_site_dir:
-        if PurePath(file.url).as_posix() == ".":
-            file.url = urlquote(locale_site_dir + "/")
+    file.abs_dest_path = os.path.normpath(os.path.join(config.site_dir, dest_uri))
+    file.name = classification.name
 
     # save some i18n metadata
     # alternates should list themselves
-    file.alternates = {current_language: file}
-    file.locale = file_locale
-    file.locale_alternate_of = current_language
-    file.localization = file_localization
-
-    # compute the normalized (non localized) src_uri
-    file.norm_src_uri = file.src_uri
-    if file.localization:
-        file.norm_src_uri = file.src_uri.replace(f".{file.localization}", "", 1)
+    file.i18n_info = classification.i18n_info
+    file.alternates = I18nAlternates(classifier.language_positions, current_language, file)
 
-    log.debug(f"reconfigure {file} from locale {file_locale}")
+    log.debug(f"reconfigure {file} from locale {file.locale}")
 
     return file
 
 
-class I18nFiles(Files):
+class I18nFiles(BaseI18nFiles):
     """
     We need to override Files to handle the automagic discovery of resources allowing
     users to not specify their suffixed version of the resource (think image).
 
     Example: french page displaying image.fr.png can use [my french img](image.png)
 
-    This is made possible by overriding 'get_file_from_path' below.
+    This is made possible by the resolution of the expected src_uris below.
     """
 
-    def __init__(self, plugin, files: Files) -> None:
-        super().__init__(files)
-        self.plugin = plugin
-
-    def get_file_from_path(self, path: str) -> Optional[File]:
-        """
-        Used by mkdocs.structure.nav.get_navigation to find resources linked in markdown.
-        """
-        expected_src_uri = PurePath(path)
-        if expected_src_uri == PurePath("."):
-            expected_src_uri = PurePath("index.md")
-        expected_src_uris = [
-            expected_src_uri.with_suffix(
-                f".{self.plugin.current_language}{expected_src_uri.suffix}"
-            ),
-            expected_src_uri.with_suffix(
-                f".{self.plugin.default_language}{expected_src_uri.suffix}"
-            ),
-            expected_src_uri,
-        ]
-        for src_uri in expected_src_uris:
-            file = self.src_uris.get(src_uri.as_posix())
-            if file:
-                return file
-        else:
-            return None
+    def get_expected_src_uris(self, src_uri: str) -> Tuple[str, ...]:
+        # same as PurePath(src_uri).with_suffix(f".{language}{PurePath(src_uri).suffix}")
+        src_uri_suffix = _split_suffix(src_uri.rpartition("/")[2])[1]
+        src_uri_stem = src_uri[: len(src_uri) - len(src_uri_suffix)]
+        return (
+            f"{src_uri_stem}.{self.plugin.current_language}{src_uri_suffix}",
+            f"{src_uri_stem}.{self.plugin.default_language}{src_uri_suffix}",
+            src_uri,
+        )
+
+    def get_requesting_src_uris(self, src_uri: str) -> List[str]:
+        src_uri_suffix = _split_suffix(src_uri.rpartition("/")[2])[1]
+        requesting_src_uris = [src_uri]
+        for language in (self.plugin.current_language, self.plugin.default_language):
+            # the localized version of a src_uri with or without a suffix
+            for localized_suffix, suffix in (
+                (f".{language}{src_uri_suffix}", src_uri_suffix),
+                (f".{language}", ""),
+            ):
+                if src_uri.endswith(localized_suffix):
+                    requesting_src_uris.append(src_uri[: -len(localized_suffix)] + suffix)
+        return requesting_src_uris
@@ -5,6 +5,8 @@ from pathlib import Path
 from mkdocs.commands.build import build
 from mkdocs.config.base import load_config
 
+from mkdocs_static_i18n.admonitions import AdmonitionTranslator
+
 ADMONITIONS_CONFIG_WARNING = "mkdocs_static_i18n: admonition_translations used, but admonitions won't be rendered properly without 'admonition' in mkdocs.yml's markdown_extensions."
 
 class LogHandlerList(logging.Handler):
@@ -19,9 +21,10 @@ class LogHandlerList(logging.Handler):
             self.messages.append(record.getMessage())
         return rv
 
-def test_invalid_config():
+def test_invalid_config(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "material"},
         docs_dir="admonitions/",
         plugins={
@@ -55,9 +58,10 @@ def test_invalid_config():
     assert(ADMONITIONS_CONFIG_WARNING in warning_list.messages)
     
 
-def test_plugin_no_use_directory_urls_default_language_only():
+def test_plugin_no_use_directory_urls_default_language_only(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "material"},
         docs_dir="admonitions/",
         plugins={
@@ -117,3 +121,53 @@ def test_plugin_no_use_directory_urls_default_language_only():
             'Conseil', # !!! Tip (uppercase)
             'Conseil', # !!!Tip
         ])
+
+
+def test_admonition_translator():
+    translator = AdmonitionTranslator({"Tip": "Conseil", "note": "Remarque"}, details=False)
+    markdown = "\n".join([
+        "# Page",
+        "!!! tip",
+        "    Translated",
+        "```markdown",
+        "!!! tip",
+        "```",
+        "~~~~",
+        "!!! note",
+        "```",
+        "!!! note",
+        "~~~~",
+        "    !!! note \"\"",
+        "        Translated nested admonition with an empty title",
+        "!!! tip \"Explicit\"",
+        "??? tip",
+        "",
+    ])
+    translated_markdown, translated = translator.translate(markdown)
+    assert translated == 2
+    assert translated_markdown == markdown.replace(
+        "!!! tip\n    Translated", "!!! tip \"Conseil\"\n    Translated"
+    ).replace("    !!! note \"\"", "    !!! note \"Remarque\"")
+
+    # unclosed fences run to the end of the markdown
+    assert translator.translate("```\n!!! tip\n") == ("```\n!!! tip\n", 0)
+
+    # inline code spans are not fences, a tilde fence info string may contain backticks
+    assert translator.translate("```x``` text\n!!! tip\n") == (
+        "```x``` text\n!!! tip \"Conseil\"\n",
+        1,
+    )
+    assert translator.translate("~~~ `x`\n!!! tip\n~~~\n") == ("~~~ `x`\n!!! tip\n~~~\n", 0)
+
+    # details are only translated when the pymdownx.details extension is used
+    translator = AdmonitionTranslator({"tip": "Conseil"}, details=True)
+    assert translator.translate("???+ tip\n    Details\n") == ("???+ tip \"Conseil\"\n    Details\n", 1)
+
+    # the line endings are left as is
+    assert translator.translate("??? tip\r\n    Details\r\n") == (
+        "??? tip \"Conseil\"\r\n    Details\r\n",
+        1,
+    )
+
+    # pages without admonitions are returned as is
+    assert translator.translate("# Page\r\n") == ("# Page\r\n", 0)
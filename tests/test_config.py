@@ -1,3 +1,4 @@
+import pytest
 from mkdocs.config.base import load_config
 
 from mkdocs_static_i18n.plugin import I18n
@@ -40,3 +41,32 @@ def test_plugin_theme_sitemap():
     )
     result = plugin.on_config(config)
     assert result["theme"].dirs[0].endswith("custom_i18n_sitemap")
+
+
+def test_plugin_language_registry():
+    plugin = I18n()
+    plugin.load_config(
+        {
+            "languages": [
+                {"locale": "fr", "name": "français"},
+                {"locale": "en", "name": "english", "default": True},
+                {"locale": "de", "name": "deutsch", "build": False},
+                {"locale": "null", "name": "Help translating", "fixed_link": "https://x.y"},
+            ]
+        }
+    )
+    registry = plugin.language_registry
+    assert plugin.all_languages == ["fr", "en", "de", "null"]
+    assert plugin.default_language == "en"
+    assert plugin.build_languages == ["fr", "en"]
+    assert plugin.search_languages == ("en", "fr")
+    assert registry.build_languages_set == frozenset(["fr", "en"])
+    assert registry.build_prefixes == ("fr/", "en/")
+    assert registry.positions == {"de": 0, "en": 1, "fr": 2, "null": 3}
+    assert plugin.get_language_config("de").build is False
+    plugin.current_language = "fr"
+    assert plugin.current_language_config.name == "français"
+    with pytest.raises(TypeError):
+        registry.configs["it"] = registry.configs["fr"]
+    with pytest.raises(Exception, match="Could not find language locale 'it'"):
+        plugin.get_language_config("it")
@@ -5,9 +5,10 @@ from pathlib import Path
 from mkdocs.commands.build import build
 from mkdocs.config.base import load_config
 
-def test_plugin_no_use_directory_urls_default_language_only():
+def test_plugin_no_use_directory_urls_default_language_only(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "material"},
         docs_dir="details/",
         plugins={
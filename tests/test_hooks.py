@@ -2,9 +2,10 @@ from mkdocs.commands.build import build
 from mkdocs.config.base import load_config
 
 
-def test_hooks_working():
+def test_hooks_working(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -21,7 +22,7 @@ def test_hooks_working():
     build(mkdocs_config)
 
 
-def test_hooks_env_modified():
+def test_hooks_env_modified(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
         theme={"name": "mkdocs", "custom_dir": "theme_overrides"},
@@ -36,6 +37,6 @@ def test_hooks_env_modified():
             },
         },
         hooks=["hooks_jinja_on_env.py"],
-        site_dir="/tmp/xoxo/",
+        site_dir=str(tmp_path),
     )
     build(mkdocs_config)
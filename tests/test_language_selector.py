@@ -98,9 +98,10 @@ def test_plugin_language_selector_single_default_language():
     assert result["extra"] == {}
 
 
-def test_plugin_language_selector_fixed_link():
+def test_plugin_language_selector_fixed_link(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "material"},
         docs_dir="docs_suffix_structure_two_languages/",
         plugins={
@@ -126,9 +127,10 @@ def test_plugin_language_selector_fixed_link():
     build(mkdocs_config)
 
 
-def test_plugin_language_selector_fixed_link_with_static_alternate():
+def test_plugin_language_selector_fixed_link_with_static_alternate(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "material"},
         docs_dir="docs_suffix_structure_two_languages/",
         extra={
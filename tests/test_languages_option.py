@@ -314,3 +314,63 @@ def test_plugin_build_only_locale_abort():
                 }
             },
         )
+
+
+def test_plugin_languages_config_overlays():
+    social = [{"icon": "fontawesome/brands/github", "link": "https://github.com"}]
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs", "navigation_depth": 2, "analytics": {"gtag": "G-1"}},
+        docs_dir="docs_suffix_structure_two_languages/",
+        extra={"social": social, "analytics": {"provider": "google", "property": "G-1"}},
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {
+                        "locale": "fr",
+                        "name": "français",
+                        "site_name": "Site FR",
+                        "extra": {"version": "fr"},
+                        "theme": {"navigation_depth": 3, "analytics": {"gtag": "G-FR"}},
+                    },
+                    {
+                        "locale": "de",
+                        "name": "deutsch",
+                        "extra": {"analytics": {"property": "G-DE"}},
+                    },
+                    {"locale": "es", "name": "español"},
+                ],
+            }
+        },
+    )
+    i18n_plugin = mkdocs_config["plugins"]["i18n"]
+    site_name = mkdocs_config.site_name
+    extra = mkdocs_config.extra
+    theme_analytics = mkdocs_config.theme["analytics"]
+
+    for _ in range(2):
+        for language in ["en", "fr", "de", "es"]:
+            i18n_plugin.current_language = language
+            config = i18n_plugin.on_config(mkdocs_config)
+            if language == "fr":
+                assert config.site_name == "Site FR"
+                assert config.extra["version"] == "fr"
+                # values which are not overridden are shared
+                assert config.extra["social"] is social
+                assert config.theme["navigation_depth"] == 3
+                assert config.theme["analytics"] == {"gtag": "G-FR"}
+            elif language == "de":
+                assert config.site_name == site_name
+                assert config.extra["analytics"] == {"property": "G-DE"}
+                assert config.theme["navigation_depth"] == 2
+            else:
+                # the original values are restored and never altered
+                assert config.site_name == site_name
+                assert config.extra is extra
+                assert config.extra["analytics"] == {"provider": "google", "property": "G-1"}
+                assert "version" not in config.extra
+                assert config.theme["navigation_depth"] == 2
+                assert config.theme["analytics"] is theme_analytics
+                assert theme_analytics == {"gtag": "G-1"}
+    assert set(i18n_plugin.config_overlays) == {"en", "fr", "de", "es"}
@@ -0,0 +1,80 @@
+import os
+
+import pytest
+from mkdocs.commands import build as mkdocs_build
+from mkdocs.config.base import load_config
+
+from mkdocs_static_i18n import cache, parallel
+from mkdocs_static_i18n.cache import MarkdownCache
+
+
+@pytest.mark.parametrize("parallel_builds", [0, 2])
+def test_markdown_cache(tmp_path, parallel_builds):
+    if parallel_builds and not parallel.can_fork():
+        pytest.skip("parallel builds require the fork start method")
+    translations = {"tip": "Conseil", "warning": "Avertissement"}
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs"},
+        docs_dir="admonitions/",
+        site_dir=str(tmp_path / "site"),
+        markdown_extensions=["admonition"],
+        plugins={
+            "i18n": {
+                "markdown_cache_dir": str(tmp_path / "cache"),
+                "parallel_builds": parallel_builds,
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français", "admonition_translations": translations},
+                    # the fallback page is cached with the de translations
+                    {"locale": "de", "name": "deutsch", "admonition_translations": translations},
+                ],
+            },
+        },
+    )
+    i18n_plugin = mkdocs_config.plugins["i18n"]
+
+    mkdocs_build.build(mkdocs_config)
+    # pages without translations are not cached
+    assert i18n_plugin.markdown_cache.counts == (0, 2)
+    assert len(list((tmp_path / "cache").glob("*.json"))) == 2
+    fr_index = (tmp_path / "site" / "fr" / "index.html").read_text()
+    assert "Avertissement" in fr_index
+
+    mkdocs_build.build(mkdocs_config)
+    assert i18n_plugin.markdown_cache.counts == (2, 0)
+    assert (tmp_path / "site" / "fr" / "index.html").read_text() == fr_index
+
+
+def test_markdown_cache_eviction(tmp_path):
+    markdown_cache = MarkdownCache(str(tmp_path), 0)
+    context_digest = MarkdownCache.get_context_digest("fr", {"tip": "Conseil"}, ["admonition"])
+    keys = [markdown_cache.get_key(context_digest, f"!!! tip {i}") for i in range(3)]
+    for key in keys:
+        markdown_cache.set(key, "!!! tip", 1)
+    size = sum(path.stat().st_size for path in tmp_path.glob("*.json"))
+    # the first entry is the most recently used one
+    os.utime(markdown_cache.get_path(keys[0]), (0, 0))
+    os.utime(markdown_cache.get_path(keys[1]), (1, 1))
+    os.utime(markdown_cache.get_path(keys[2]), (2, 2))
+    assert markdown_cache.get(keys[0]) == ("!!! tip", 1)
+
+    markdown_cache.max_size = size * 2 // 3
+    assert markdown_cache.evict() == 1
+    assert markdown_cache.get(keys[1]) is None
+    assert markdown_cache.get(keys[0]) == ("!!! tip", 1)
+    assert markdown_cache.counts == (2, 1)
+
+
+def test_markdown_cache_context_digest(monkeypatch):
+    context_digest = MarkdownCache.get_context_digest("fr", {"tip": "Conseil"}, ["admonition"])
+    # the entries of another plugin version or cache format are not reused
+    monkeypatch.setattr(cache, "version", "0.0.0")
+    assert MarkdownCache.get_context_digest("fr", {"tip": "Conseil"}, ["admonition"]) != (
+        context_digest
+    )
+    monkeypatch.undo()
+    monkeypatch.setattr(cache, "CACHE_FORMAT", cache.CACHE_FORMAT + 1)
+    assert MarkdownCache.get_context_digest("fr", {"tip": "Conseil"}, ["admonition"]) != (
+        context_digest
+    )
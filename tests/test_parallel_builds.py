@@ -0,0 +1,122 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+from mkdocs.commands.build import build
+from mkdocs.config.base import load_config
+from mkdocs.exceptions import Abort
+
+from mkdocs_static_i18n import parallel
+
+
+def build_site(docs_dir, tmp_path, parallel_builds):
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs"},
+        use_directory_urls=True,
+        docs_dir=docs_dir,
+        site_dir=str(tmp_path / f"site_{parallel_builds}"),
+        plugins={
+            "search": {},
+            "i18n": {
+                "docs_structure": "suffix" if "suffix" in docs_dir else "folder",
+                "parallel_builds": parallel_builds,
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    build(mkdocs_config)
+    return mkdocs_config
+
+
+@pytest.mark.skipif(not parallel.can_fork(), reason="parallel builds require fork")
+@pytest.mark.parametrize(
+    "docs_dir",
+    ["docs_suffix_structure_two_languages/", "docs_folder_structure_two_languages/"],
+)
+def test_parallel_builds(docs_dir, monkeypatch, tmp_path):
+    # MkDocs < 1.6 stamps the sitemap.xml.gz with the current time
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    sequential_config = build_site(docs_dir, tmp_path, 0)
+    parallel_config = build_site(docs_dir, tmp_path, 2)
+
+    sequential_site = Path(sequential_config.site_dir)
+    parallel_site = Path(parallel_config.site_dir)
+    assert sorted(f.relative_to(parallel_site) for f in parallel_site.glob("**/*")) == sorted(
+        f.relative_to(sequential_site) for f in sequential_site.glob("**/*")
+    )
+    # the files shared by the languages (think the root 404.html) are the ones of the
+    # last built language like in a sequential build
+    for sequential_file in sequential_site.glob("**/*"):
+        if sequential_file.is_file():
+            parallel_file = parallel_site / sequential_file.relative_to(sequential_site)
+            assert parallel_file.read_bytes() == sequential_file.read_bytes(), parallel_file
+
+    sequential_entries = sequential_config.plugins["search"].search_index._entries
+    parallel_entries = parallel_config.plugins["search"].search_index._entries
+    assert parallel_entries == sequential_entries
+
+
+def test_parallel_builds_validation():
+    with pytest.raises(Abort):
+        load_config(
+            "tests/mkdocs.yml",
+            docs_dir="docs_suffix_structure_two_languages/",
+            plugins={
+                "i18n": {
+                    "parallel_builds": -1,
+                    "languages": [{"locale": "en", "name": "english", "default": True}],
+                },
+            },
+        )
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="pre-built search indexes require node")
+def test_parallel_prebuilt_search_indexes(monkeypatch, tmp_path):
+    prebuild_workers = []
+    prebuild_search_indexes = parallel.prebuild_search_indexes
+
+    def count_prebuild_search_indexes(search_index, configs, entries, workers):
+        prebuild_workers.append(workers)
+        return prebuild_search_indexes(search_index, configs, entries, workers)
+
+    monkeypatch.setattr(parallel, "prebuild_search_indexes", count_prebuild_search_indexes)
+    search_indexes = {}
+    for parallel_builds in [0, 1, 2]:
+        site_dir = tmp_path / f"site_{parallel_builds}"
+        mkdocs_config = load_config(
+            "tests/mkdocs.yml",
+            theme={"name": "mkdocs"},
+            docs_dir="docs_suffix_structure_two_languages/",
+            site_dir=str(site_dir),
+            plugins={
+                "search": {"prebuild_index": True},
+                "i18n": {
+                    "parallel_builds": parallel_builds,
+                    "search_index_per_language": True,
+                    "languages": [
+                        {"locale": "en", "name": "english", "default": True},
+                        {"locale": "fr", "name": "français"},
+                        {"locale": "de", "name": "deutsch"},
+                    ],
+                },
+            },
+        )
+        build(mkdocs_config)
+        search_indexes[parallel_builds] = {
+            locale: (site_dir / locale / "search" / "search_index.json").read_text()
+            for locale in ["", "fr", "de"]
+        }
+
+    # a single worker uses the pool just like the language builds
+    assert prebuild_workers == [1, 2]
+    assert search_indexes[1] == search_indexes[0]
+    assert search_indexes[2] == search_indexes[0]
+    fr_search_index = json.loads(search_indexes[2]["fr"])
+    assert fr_search_index["config"]["lang"] == ["fr"]
+    assert fr_search_index["index"]["pipeline"] == ["stemmer-fr"]
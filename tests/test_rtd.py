@@ -4,9 +4,10 @@ from mkdocs.commands.build import build
 from mkdocs.config.base import load_config
 
 
-def test_rtd_fontfiles():
+def test_rtd_fontfiles(tmp_path):
     config_base_rtd = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path / "base"),
         theme={"name": "readthedocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -14,6 +15,7 @@ def test_rtd_fontfiles():
 
     config_plugin_rtd = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path / "i18n"),
         theme={"name": "readthedocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -1,11 +1,17 @@
+import json
+import re
+from urllib.parse import urljoin, urlsplit
+
+import pytest
 from mkdocs.commands.build import build
 from mkdocs.config.base import load_config
 
 
-def test_search_entries():
+def test_search_entries(tmp_path):
     for theme in ["mkdocs", "material"]:
         mkdocs_config = load_config(
             "tests/mkdocs.yml",
+            site_dir=str(tmp_path),
             theme={"name": theme},
             use_directory_urls=True,
             docs_dir="docs_suffix_structure_two_languages/",
@@ -34,9 +40,10 @@ def test_search_entries():
             assert len(search_plugin.search_index.entries) == 26
 
 
-def test_search_entries_no_directory_urls():
+def test_search_entries_no_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=False,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -59,9 +66,10 @@ def test_search_entries_no_directory_urls():
     assert len(search_plugin.search_index._entries) == 36
 
 
-def test_search_entries_no_reconfigure():
+def test_search_entries_no_reconfigure(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -85,9 +93,10 @@ def test_search_entries_no_reconfigure():
     assert len(search_plugin.search_index._entries) == 40
 
 
-def test_search_add_lang():
+def test_search_add_lang(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -110,9 +119,10 @@ def test_search_add_lang():
     assert search_plugin.config["lang"] == ["en", "fr"]
 
 
-def test_search_add_missing_lang():
+def test_search_add_missing_lang(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -138,9 +148,10 @@ def test_search_add_missing_lang():
     assert search_plugin.config["lang"] == ["en", "fr"]
 
 
-def test_search_no_add_lang():
+def test_search_no_add_lang(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -164,3 +175,241 @@ def test_search_no_add_lang():
     build(mkdocs_config)
     search_plugin = mkdocs_config["plugins"]["search"]
     assert search_plugin.config["lang"] == ["en"]
+
+
+def test_search_duplicates():
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs"},
+        docs_dir="docs_suffix_structure_two_languages/",
+        plugins={
+            "search": {},
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    i18n_plugin = mkdocs_config["plugins"]["i18n"]
+    search_index_entries = [
+        {"location": "", "title": "Home", "text": "Welcome"},
+        {"location": "page/", "title": "Page", "text": "Page text"},
+        {"location": "fr/", "title": "Home", "text": "Bienvenue"},
+        {"location": "fr/page/", "title": "Page", "text": "Page text"},
+        {"location": "de/", "title": "Home", "text": "Willkommen"},
+        {"location": "de/page/", "title": "Page", "text": "Page text"},
+        {"location": "de/page/#section", "title": "Page", "text": "Page text"},
+    ]
+    i18n_plugin.reconfigure_search_duplicates(search_index_entries)
+    assert [entry["location"] for entry in search_index_entries] == [
+        "",
+        "page/",
+        "fr/",
+        "de/",
+        "de/page/#section",
+    ]
+
+
+def test_search_index_per_language(tmp_path):
+    for theme in ["mkdocs", "material"]:
+        site_dir = tmp_path / theme
+        mkdocs_config = load_config(
+            "tests/mkdocs.yml",
+            theme={"name": theme},
+            use_directory_urls=True,
+            docs_dir="docs_suffix_structure_two_languages/",
+            site_dir=str(site_dir),
+            plugins={
+                "search": {},
+                "i18n": {
+                    "search_index_per_language": True,
+                    "languages": [
+                        {
+                            "locale": "en",
+                            "name": "english",
+                            "default": True,
+                        },
+                        {"locale": "fr", "name": "français"},
+                    ],
+                },
+            },
+        )
+        if theme == "material":
+            mkdocs_config["plugins"]["material/search"].on_startup(command=None, dirty=False)
+        build(mkdocs_config)
+
+        en_index = json.loads((site_dir / "search" / "search_index.json").read_text())
+        fr_index = json.loads((site_dir / "fr" / "search" / "search_index.json").read_text())
+        assert en_index["config"]["lang"] == ["en"]
+        assert fr_index["config"]["lang"] == ["fr"]
+        assert en_index["docs"] and fr_index["docs"]
+        assert not any(doc["location"].startswith("fr/") for doc in en_index["docs"])
+        assert ("fr/french_only/", "This page only exists on the French version") in {
+            (doc["location"], doc["title"]) for doc in fr_index["docs"]
+        }
+
+        # resolve the urls of the rendered pages like a browser does
+        def site_path(url):
+            path = urlsplit(url).path.lstrip("/")
+            return site_dir / (path + "index.html" if path == "" or path.endswith("/") else path)
+
+        page_url = "https://example.com/fr/"
+        fr_page = (site_dir / "fr" / "index.html").read_text()
+        if theme == "mkdocs":
+            # the base url is untouched, the localized search/main.js starts the localized worker
+            assert 'var base_url = ".."' in fr_page
+            base_url = urljoin(page_url, "../")
+            main_js = re.search(r'<script src="([^"]*search/main\.js)"', fr_page).group(1)
+            assert site_path(urljoin(page_url, main_js)) == site_dir / "fr" / "search" / "main.js"
+            assert '"fr/search/worker.js"' in site_path(urljoin(page_url, main_js)).read_text()
+            worker_url = urljoin(base_url, "fr/search/worker.js")
+            assert site_path(worker_url).is_file()
+            # the worker loads the search index next to it
+            index_url = urljoin(worker_url, "search_index.json")
+        else:
+            # the base url is untouched, the search index requests are redirected
+            config = json.loads(
+                re.search(
+                    r'<script id="__config" type="application/json">(.*?)</script>', fr_page, re.S
+                ).group(1)
+            )
+            assert config["base"] == ".."
+            base_url = urljoin(page_url, config["base"] + "/")
+            index, localized = json.loads(
+                "[%s]"
+                % re.search(
+                    r"<script>// mkdocs-static-i18n.*?\}\)\((.*?)\)</script>\s*"
+                    r'<script src="[^"]*assets/javascripts/bundle\.',
+                    fr_page,
+                    re.S,
+                ).group(1)
+            )
+            assert urljoin(page_url, index) == urljoin(base_url, "search/search_index.json")
+            index_url = urljoin(page_url, localized)
+        assert json.loads(site_path(index_url).read_text()) == fr_index
+        # the search results link to the localized pages
+        for doc in fr_index["docs"]:
+            assert site_path(urljoin(base_url, doc["location"])).is_file()
+
+        en_page = (site_dir / "index.html").read_text()
+        assert "<script>// mkdocs-static-i18n" not in en_page
+        assert "fr/search" not in en_page
+
+
+@pytest.mark.parametrize("theme", ["mkdocs", "material"])
+@pytest.mark.parametrize("reconfigure_search", [True, False])
+def test_stream_search_entries(theme, reconfigure_search, tmp_path):
+    search_indexes = {}
+    for stream_search_entries in [False, True]:
+        site_dir = tmp_path / f"site_{stream_search_entries}"
+        mkdocs_config = load_config(
+            "tests/mkdocs.yml",
+            theme={"name": theme},
+            use_directory_urls=True,
+            docs_dir="docs_suffix_structure_two_languages/",
+            site_dir=str(site_dir),
+            plugins={
+                "search": {},
+                "i18n": {
+                    "reconfigure_search": reconfigure_search,
+                    "stream_search_entries": stream_search_entries,
+                    "languages": [
+                        {
+                            "locale": "en",
+                            "name": "english",
+                            "default": True,
+                        },
+                        {"locale": "fr", "name": "français"},
+                        {"locale": "de", "name": "deutsch"},
+                    ],
+                },
+            },
+        )
+        if theme == "material":
+            mkdocs_config["plugins"]["material/search"].on_startup(command=None, dirty=False)
+        build(mkdocs_config)
+        search_indexes[stream_search_entries] = (
+            site_dir / "search" / "search_index.json"
+        ).read_text()
+        i18n_plugin = mkdocs_config["plugins"]["i18n"]
+        assert i18n_plugin.search_entries_spool is None
+
+    assert search_indexes[True] == search_indexes[False]
+
+
+@pytest.mark.parametrize("search_index_per_language", [False, True])
+def test_search_index_written_once(search_index_per_language, tmp_path):
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs"},
+        docs_dir="docs_suffix_structure_two_languages/",
+        site_dir=str(tmp_path),
+        plugins={
+            "search": {},
+            "i18n": {
+                "search_index_per_language": search_index_per_language,
+                "languages": [
+                    {
+                        "locale": "en",
+                        "name": "english",
+                        "default": True,
+                    },
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    build(mkdocs_config)
+    i18n_plugin = mkdocs_config["plugins"]["i18n"]
+    # every language build deferred its search index write
+    assert i18n_plugin.deferred_search_index_writes == 3
+    assert i18n_plugin.search_index_writes == (3 if search_index_per_language else 1)
+    search_index = json.loads((tmp_path / "search" / "search_index.json").read_text())
+    fr_docs = [doc for doc in search_index["docs"] if doc["location"].startswith("fr/")]
+    assert bool(fr_docs) is not search_index_per_language
+
+
+def test_compact_search_index(tmp_path):
+    search_indexes = {}
+    for compact_search_index in [False, True]:
+        site_dir = tmp_path / f"site_{compact_search_index}"
+        mkdocs_config = load_config(
+            "tests/mkdocs.yml",
+            theme={"name": "mkdocs"},
+            docs_dir="docs_suffix_structure_two_languages/",
+            site_dir=str(site_dir),
+            plugins={
+                "search": {},
+                "i18n": {
+                    "compact_search_index": compact_search_index,
+                    "languages": [
+                        {
+                            "locale": "en",
+                            "name": "english",
+                            "default": True,
+                        },
+                        {"locale": "fr", "name": "français"},
+                        {"locale": "de", "name": "deutsch"},
+                    ],
+                },
+            },
+        )
+        build(mkdocs_config)
+        search_indexes[compact_search_index] = (
+            site_dir / "search" / "search_index.json"
+        ).read_text()
+
+    assert "text_ref" in (tmp_path / "site_True" / "search" / "worker.js").read_text()
+    assert "text_ref" not in (tmp_path / "site_False" / "search" / "worker.js").read_text()
+    assert len(search_indexes[True]) < len(search_indexes[False])
+
+    # expand the text references like the search worker does
+    compact_docs = json.loads(search_indexes[True])["docs"]
+    for doc in compact_docs:
+        if "text_ref" in doc:
+            doc["text"] = compact_docs[doc.pop("text_ref")]["text"]
+    assert compact_docs == json.loads(search_indexes[False])["docs"]
@@ -0,0 +1,236 @@
+import os
+import re
+import shutil
+import subprocess
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+from mkdocs.commands import build as mkdocs_build
+from mkdocs.commands.build import build
+from mkdocs.config.base import load_config
+from mkdocs.exceptions import Abort
+
+from mkdocs_static_i18n import reconfigure
+from mkdocs_static_i18n.plugin import I18n
+
+
+def build_site(tmp_path, name, docs_dir, theme, use_directory_urls, **i18n_options):
+    site_dir = tmp_path / name
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": theme},
+        use_directory_urls=use_directory_urls,
+        docs_dir=docs_dir,
+        site_dir=str(site_dir),
+        plugins={
+            "i18n": {
+                "docs_structure": "suffix" if "suffix" in docs_dir else "folder",
+                **i18n_options,
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    build(mkdocs_config)
+    return mkdocs_config
+
+
+@pytest.mark.parametrize("theme", ["mkdocs", "material"])
+@pytest.mark.parametrize("use_directory_urls", [True, False])
+@pytest.mark.parametrize(
+    "docs_dir",
+    ["docs_suffix_structure_two_languages/", "docs_folder_structure_two_languages/"],
+)
+def test_native_sitemap(monkeypatch, tmp_path, docs_dir, theme, use_directory_urls):
+    # MkDocs < 1.6 stamps the sitemap.xml.gz with the current time
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+    native_site_dir = Path(
+        build_site(tmp_path, "native", docs_dir, theme, use_directory_urls).site_dir
+    )
+
+    # render the custom_i18n_sitemap/sitemap.xml template like users provided ones
+    monkeypatch.setattr(I18n, "is_i18n_sitemap_template", lambda self, template: False)
+    template_site_dir = Path(
+        build_site(tmp_path, "template", docs_dir, theme, use_directory_urls).site_dir
+    )
+
+    native_sitemap = (native_site_dir / "sitemap.xml").read_bytes()
+    assert b'hreflang="fr"' in native_sitemap
+    assert native_sitemap == (template_site_dir / "sitemap.xml").read_bytes()
+    assert (native_site_dir / "sitemap.xml.gz").read_bytes() == (
+        template_site_dir / "sitemap.xml.gz"
+    ).read_bytes()
+
+
+def test_sitemap_index(tmp_path):
+    docs_dir = "docs_suffix_structure_two_languages/"
+    mkdocs_config = build_site(
+        tmp_path, "index", docs_dir, "mkdocs", True, sitemap_index=True, sitemap_max_urls=4
+    )
+    site_dir = Path(mkdocs_config.site_dir)
+    site_url = mkdocs_config.site_url
+
+    assert not (site_dir / "sitemap.xml").exists()
+    sitemap_index = (site_dir / "sitemap_index.xml").read_text()
+    sitemaps = re.findall(r"<loc>(.*?)</loc>", sitemap_index)
+    assert sitemaps == [
+        f"{site_url}sitemap-en.xml",
+        f"{site_url}sitemap-en-2.xml",
+        f"{site_url}sitemap-fr.xml",
+        f"{site_url}sitemap-fr-2.xml",
+        f"{site_url}sitemap-de.xml",
+        f"{site_url}sitemap-de-2.xml",
+    ]
+
+    # the sitemaps list the same urls as the complete sitemap.xml
+    complete_site_dir = Path(build_site(tmp_path, "complete", docs_dir, "mkdocs", True).site_dir)
+    complete_urls = re.findall(
+        r"<url>.*?</url>", (complete_site_dir / "sitemap.xml").read_text(), re.S
+    )
+    urls = []
+    for sitemap in sitemaps:
+        sitemap_urls = re.findall(
+            r"<url>.*?</url>", (site_dir / sitemap[len(site_url) :]).read_text(), re.S
+        )
+        assert 0 < len(sitemap_urls) <= 4
+        urls.extend(sitemap_urls)
+    assert urls == complete_urls
+
+
+def test_sitemap_index_without_site_url(tmp_path, caplog):
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs"},
+        docs_dir="docs_suffix_structure_two_languages/",
+        site_dir=str(tmp_path),
+        plugins={
+            "i18n": {
+                "sitemap_index": True,
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                ],
+            },
+        },
+    )
+    mkdocs_config["site_url"] = None
+    build(mkdocs_config)
+
+    # sitemap locations must be absolute, the sitemap.xml is written instead
+    assert "sitemap_index requires the 'site_url' option" in caplog.text
+    assert not (tmp_path / "sitemap_index.xml").exists()
+    assert not list(tmp_path.glob("sitemap-*.xml"))
+    assert 'hreflang="fr"' in (tmp_path / "sitemap.xml").read_text()
+
+
+def test_sitemap_max_urls_validation():
+    with pytest.raises(Abort):
+        load_config(
+            "tests/mkdocs.yml",
+            docs_dir="docs_suffix_structure_two_languages/",
+            plugins={
+                "i18n": {
+                    "sitemap_max_urls": 50001,
+                    "languages": [{"locale": "en", "name": "english", "default": True}],
+                },
+            },
+        )
+
+
+def get_lastmod_dates(site_dir: Path):
+    return dict(
+        re.findall(
+            r"<loc>(.*?)</loc>\s*<lastmod>(.*?)</lastmod>", (site_dir / "sitemap.xml").read_text()
+        )
+    )
+
+
+@pytest.mark.parametrize("sitemap_lastmod", ["mtime", "git"])
+def test_sitemap_lastmod(tmp_path, sitemap_lastmod):
+    docs_dir = tmp_path / "docs_suffix_structure_two_languages"
+    shutil.copytree("tests/docs_suffix_structure_two_languages", docs_dir)
+    first_date = datetime(2020, 1, 2, 12, tzinfo=timezone.utc).timestamp()
+    fr_date = datetime(2021, 3, 4, 12, tzinfo=timezone.utc).timestamp()
+    if sitemap_lastmod == "git":
+        if shutil.which("git") is None:
+            pytest.skip("git is not available")
+
+        def commit(date, *paths):
+            env = {
+                **os.environ,
+                "GIT_AUTHOR_NAME": "i18n",
+                "GIT_AUTHOR_EMAIL": "i18n@example.com",
+                "GIT_AUTHOR_DATE": f"@{int(date)} +0000",
+                "GIT_COMMITTER_NAME": "i18n",
+                "GIT_COMMITTER_EMAIL": "i18n@example.com",
+                "GIT_COMMITTER_DATE": f"@{int(date)} +0000",
+            }
+            subprocess.run(["git", "add", *paths], cwd=tmp_path, check=True, env=env)
+            subprocess.run(["git", "commit", "-q", "-m", "docs"], cwd=tmp_path, check=True, env=env)
+
+        subprocess.run(["git", "init", "-q"], cwd=tmp_path, check=True)
+        commit(first_date, ".")
+        (docs_dir / "index.fr.md").write_text("# Bonjour\n")
+        commit(fr_date, str(docs_dir / "index.fr.md"))
+    else:
+        for path in docs_dir.rglob("*"):
+            os.utime(path, (first_date, first_date))
+        os.utime(docs_dir / "index.fr.md", (fr_date, fr_date))
+
+    mkdocs_config = build_site(
+        tmp_path, "site", str(docs_dir), "mkdocs", True, sitemap_lastmod=sitemap_lastmod
+    )
+    site_url = mkdocs_config.site_url
+    lastmod_dates = get_lastmod_dates(Path(mkdocs_config.site_dir))
+    assert lastmod_dates[site_url] == "2020-01-02"
+    assert lastmod_dates[f"{site_url}fr/"] == "2021-03-04"
+    # fallback pages use the date of the default language file
+    assert lastmod_dates[f"{site_url}de/"] == "2020-01-02"
+    assert set(lastmod_dates.values()) == {"2020-01-02", "2021-03-04"}
+
+
+def test_sitemap_rendered_once(monkeypatch, tmp_path):
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs"},
+        use_directory_urls=True,
+        docs_dir="docs_suffix_structure_two_languages/",
+        site_dir=str(tmp_path),
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    rendered_templates = []
+
+    def build_theme_template(template_name, *args):
+        rendered_templates.append(template_name)
+        return mkdocs_build_theme_template(template_name, *args)
+
+    def write_sitemap(path, *args):
+        rendered_templates.append("native sitemap.xml")
+        return reconfigure_write_sitemap(path, *args)
+
+    mkdocs_build_theme_template = mkdocs_build._build_theme_template
+    reconfigure_write_sitemap = reconfigure.write_sitemap
+    monkeypatch.setattr(mkdocs_build, "_build_theme_template", build_theme_template)
+    monkeypatch.setattr(reconfigure, "_build_theme_template", build_theme_template)
+    monkeypatch.setattr(reconfigure, "write_sitemap", write_sitemap)
+
+    mkdocs_build.build(mkdocs_config)
+    assert rendered_templates.count("sitemap.xml") == 0
+    assert rendered_templates.count("native sitemap.xml") == 1
+    assert rendered_templates.count("404.html") == 3
+    sitemap = (tmp_path / "sitemap.xml").read_text()
+    assert "/fr/" in sitemap and "/de/" in sitemap
+    # the sitemap.xml is rendered by the next builds
+    assert "sitemap.xml" in mkdocs_config.theme.static_templates
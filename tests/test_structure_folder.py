@@ -4,6 +4,8 @@ import pytest
 from mkdocs.commands.build import build
 from mkdocs.config.base import load_config
 
+from mkdocs_static_i18n import folder
+
 USE_DIRECTORY_URLS = [
     Path("404.html"),
     Path("assets/image_non_localized.png"),
@@ -46,9 +48,10 @@ NO_USE_DIRECTORY_URLS = [
 ]
 
 
-def test_build_use_directory_urls():
+def test_build_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_folder_structure_two_languages/",
@@ -62,9 +65,10 @@ def test_build_use_directory_urls():
     assert sorted(generate_site) == sorted(USE_DIRECTORY_URLS)
 
 
-def test_build_no_use_directory_urls():
+def test_build_no_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=False,
         docs_dir="docs_folder_structure_two_languages/",
@@ -126,9 +130,10 @@ PLUGIN_NO_USE_DIRECTORY_URLS = [
 ]
 
 
-def test_plugin_use_directory_urls():
+def test_plugin_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_folder_structure_two_languages/",
@@ -158,9 +163,10 @@ def test_plugin_use_directory_urls():
     assert sorted(generate_site) == sorted(PLUGIN_USE_DIRECTORY_URLS)
 
 
-def test_plugin_use_directory_urls_static_nav():
+def test_plugin_use_directory_urls_static_nav(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_folder_structure_two_languages/",
@@ -198,9 +204,10 @@ def test_plugin_use_directory_urls_static_nav():
     assert sorted(generate_site) == sorted(PLUGIN_USE_DIRECTORY_URLS)
 
 
-def test_plugin_no_use_directory_urls():
+def test_plugin_no_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=False,
         docs_dir="docs_folder_structure_two_languages/",
@@ -258,9 +265,10 @@ PLUGIN_NO_USE_DIRECTORY_URLS_DEFAULT_ONLY = [
 ]
 
 
-def test_plugin_use_directory_urls_default_language_only():
+def test_plugin_use_directory_urls_default_language_only(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_folder_structure_two_languages/",
@@ -290,9 +298,10 @@ def test_plugin_use_directory_urls_default_language_only():
     assert sorted(generate_site) == sorted(PLUGIN_USE_DIRECTORY_URLS_DEFAULT_ONLY)
 
 
-def test_plugin_no_use_directory_urls_default_language_only():
+def test_plugin_no_use_directory_urls_default_language_only(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=False,
         docs_dir="docs_folder_structure_two_languages/",
@@ -320,3 +329,14 @@ def test_plugin_no_use_directory_urls_default_language_only():
     generate_site = [f.relative_to(site_dir) for f in Path(site_dir).glob("**/*.html")]
     generate_site.extend([f.relative_to(site_dir) for f in Path(site_dir).glob("**/image*.*")])
     assert sorted(generate_site) == sorted(PLUGIN_NO_USE_DIRECTORY_URLS_DEFAULT_ONLY)
+
+
+def test_folder_locale_prefix_index():
+    index = folder.get_locale_prefix_index(("en", "fr", "null"), "en")
+    assert folder.get_locale_prefix_index(("en", "fr", "null"), "en") is index
+    assert index.get_locale("fr/topic/index.md") == "fr"
+    assert index.get_locale("null/index.md") == "null"
+    # language folders not configured yet are matched using the locale regex
+    assert index.get_locale("pt_BR/index.md") == "pt_BR"
+    assert index.get_locale("assets/image.png") is None
+    assert index.get_locale("index.md") is None
@@ -1,10 +1,16 @@
 from pathlib import Path
 
+from mkdocs import utils as mkdocs_utils
+from mkdocs.commands import build as mkdocs_build
 from mkdocs.commands.build import build
 from mkdocs.config.base import load_config
+from mkdocs.structure.files import File
 
 import pytest
 
+from mkdocs_static_i18n import suffix
+from mkdocs_static_i18n.files import BaseI18nFiles
+
 USE_DIRECTORY_URLS = [
     Path("english_default/index.en/index.html"),
     Path("404.html"),
@@ -47,9 +53,10 @@ NO_USE_DIRECTORY_URLS = [
 ]
 
 
-def test_build_use_directory_urls():
+def test_build_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -63,9 +70,10 @@ def test_build_use_directory_urls():
     assert sorted(generate_site) == sorted(USE_DIRECTORY_URLS)
 
 
-def test_build_no_use_directory_urls():
+def test_build_no_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=False,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -127,9 +135,10 @@ PLUGIN_NO_USE_DIRECTORY_URLS = [
 ]
 
 
-def test_plugin_use_directory_urls():
+def test_plugin_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -158,9 +167,10 @@ def test_plugin_use_directory_urls():
     assert sorted(generate_site) == sorted(PLUGIN_USE_DIRECTORY_URLS)
 
 
-def test_plugin_use_directory_urls_static_nav():
+def test_plugin_use_directory_urls_static_nav(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -194,9 +204,10 @@ def test_plugin_use_directory_urls_static_nav():
     assert sorted(generate_site) == sorted(PLUGIN_USE_DIRECTORY_URLS)
 
 
-def test_plugin_no_use_directory_urls():
+def test_plugin_no_use_directory_urls(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=False,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -253,9 +264,10 @@ PLUGIN_NO_USE_DIRECTORY_URLS_DEFAULT_ONLY = [
 ]
 
 
-def test_plugin_use_directory_urls_default_language_only():
+def test_plugin_use_directory_urls_default_language_only(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=True,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -284,9 +296,10 @@ def test_plugin_use_directory_urls_default_language_only():
     assert sorted(generate_site) == sorted(PLUGIN_USE_DIRECTORY_URLS_DEFAULT_ONLY)
 
 
-def test_plugin_no_use_directory_urls_default_language_only():
+def test_plugin_no_use_directory_urls_default_language_only(tmp_path):
     mkdocs_config = load_config(
         "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
         theme={"name": "mkdocs"},
         use_directory_urls=False,
         docs_dir="docs_suffix_structure_two_languages/",
@@ -313,3 +326,246 @@ def test_plugin_no_use_directory_urls_default_language_only():
     generate_site = [f.relative_to(site_dir) for f in Path(site_dir).glob("**/*.html")]
     generate_site.extend([f.relative_to(site_dir) for f in Path(site_dir).glob("**/image*.*")])
     assert sorted(generate_site) == sorted(PLUGIN_NO_USE_DIRECTORY_URLS_DEFAULT_ONLY)
+
+
+def test_docs_dir_walked_once(monkeypatch, tmp_path):
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        site_dir=str(tmp_path),
+        theme={"name": "mkdocs"},
+        use_directory_urls=True,
+        docs_dir="docs_suffix_structure_two_languages/",
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    get_files_calls = []
+
+    def get_files(config):
+        get_files_calls.append(config)
+        return mkdocs_get_files(config)
+
+    mkdocs_get_files = mkdocs_build.get_files
+    monkeypatch.setattr(mkdocs_build, "get_files", get_files)
+
+    mkdocs_build.build(mkdocs_config)
+    assert len(get_files_calls) == 1
+    # the cache must not outlive the build
+    i18n_plugin = mkdocs_config.plugins["i18n"]
+    assert i18n_plugin.docs_dir_files is None
+    assert mkdocs_build.get_files is get_files
+
+    # a new build (think mkdocs serve) walks the docs_dir again
+    mkdocs_build.build(mkdocs_config)
+    assert len(get_files_calls) == 2
+
+
+def test_failed_language_build_restores_mkdocs(tmp_path):
+    mkdocs_config = load_config(
+        "tests/mkdocs.yml",
+        theme={"name": "mkdocs"},
+        use_directory_urls=True,
+        docs_dir="docs_suffix_structure_two_languages/",
+        site_dir=str(tmp_path),
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    i18n_plugin = mkdocs_config.plugins["i18n"]
+
+    def on_nav(nav, config, files):
+        if i18n_plugin.current_language == "fr":
+            raise RuntimeError("fr build failed")
+        return nav
+
+    mkdocs_config.plugins.events["nav"].append(on_nav)
+    mkdocs_get_files = mkdocs_build.get_files
+    mkdocs_clean_directory = mkdocs_utils.clean_directory
+
+    with pytest.raises(RuntimeError, match="fr build failed"):
+        mkdocs_build.build(mkdocs_config)
+
+    assert mkdocs_build.get_files is mkdocs_get_files
+    assert mkdocs_utils.clean_directory is mkdocs_clean_directory
+    assert i18n_plugin.building is False
+    assert i18n_plugin.docs_dir_files is None
+    assert i18n_plugin.i18n_catalog is None
+    assert i18n_plugin.search_entries_spool is None
+
+
+def test_catalog(make_config):
+    mkdocs_config, files, env, nav = make_config(
+        "tests/mkdocs.yml",
+        docs_dir="docs_suffix_structure_two_languages/",
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                ],
+            },
+        },
+    )
+    catalog = mkdocs_config.plugins["i18n"].i18n_catalog
+    assert {locale: file.src_uri for locale, file in catalog.norm_src_uris["index.md"].items()} == {
+        "en": "index.md",
+        "fr": "index.fr.md",
+    }
+
+    # alternates are created once and shared by every language build
+    alternate = catalog.get_alternate("index.md", "fr")
+    assert alternate.url == "fr/"
+    assert catalog.get_alternate("index.md", "fr") is alternate
+    assert files.get_file_from_path("index.md").alternates["fr"] is alternate
+
+    # fallback to the default language version
+    alternate = catalog.get_alternate("english_default/index.md", "fr")
+    assert alternate.url == "fr/english_default/"
+    assert alternate.locale == "en"
+    assert alternate.locale_alternate_of == "fr"
+    assert alternate.page is None
+    # no default language version to fallback to
+    assert catalog.get_alternate("french_only/index.md", "en") is None
+    assert list(catalog.get_alternate_files("french_only/index.md")) == ["fr"]
+    assert list(catalog.get_alternate_files("english_default/index.md")) == ["en", "fr"]
+
+
+def test_suffix_locale_classifier():
+    classifier = suffix.get_locale_classifier(("en", "fr"), "en", True)
+    assert suffix.get_locale_classifier(("en", "fr"), "en", True) is classifier
+
+    file = File("topic/README.fr.md", "/docs", "/site", True)
+    classification = classifier.classify(file)
+    assert classification.name == "index"
+    assert classification.dest_uri == "topic/index.html"
+    assert classification.i18n_info.norm_src_uri == "topic/README.md"
+    assert classification.i18n_info.locale == "fr"
+    assert classification.i18n_info.localization == "fr"
+    # classifications are memoized for every language build
+    assert classifier.classify(File("topic/README.fr.md", "/docs", "/site", True)) is (
+        classification
+    )
+    # and so are the language classifications of the files
+    file = File("topic/README.fr.md", "/docs", "/site", True, dest_uri="blog/index.html")
+    assert classifier.classify(file).i18n_info is classification.i18n_info
+
+    # locales not configured yet are matched using the locale regex
+    classification = classifier.classify(File("image.pt_BR.png", "/docs", "/site", True))
+    assert classification.dest_uri == "image.png"
+    assert classification.i18n_info.norm_src_uri == "image.png"
+    assert classification.i18n_info.localization == "pt_BR"
+    classification = classifier.classify(File("release.1.md", "/docs", "/site", True))
+    assert classification.i18n_info.locale == "en"
+    assert classification.i18n_info.localization is None
+
+
+def test_files_resolutions(make_config):
+    mkdocs_config, files, env, nav = make_config(
+        "tests/mkdocs.yml",
+        docs_dir="docs_suffix_structure_two_languages/",
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                ],
+            },
+        },
+    )
+    # links to the user provided files are resolved in bulk
+    assert files.resolutions["index.md"] is files.get_file_from_path(".")
+    assert files.get_file_from_path("image.png").src_uri == "image.en.png"
+    assert files.get_file_from_path("./index.md") is files.resolutions["index.md"]
+
+    # resolutions are updated when files are added or removed
+    assert files.get_file_from_path("logo.png") is None
+    logo = File("logo.en.png", mkdocs_config.docs_dir, mkdocs_config.site_dir, True)
+    files.append(logo)
+    assert files.get_file_from_path("logo.png") is logo
+    files.remove(logo)
+    assert files.get_file_from_path("logo.png") is None
+
+    # the structures must tell how to resolve the src_uris
+    class IncompleteI18nFiles(BaseI18nFiles):
+        def get_expected_src_uris(self, src_uri):
+            return [src_uri]
+
+    with pytest.raises(TypeError):
+        IncompleteI18nFiles(files.plugin, files)
+
+
+def test_i18n_file_alternates(make_config):
+    mkdocs_config, files, env, nav = make_config(
+        "tests/mkdocs.yml",
+        docs_dir="docs_suffix_structure_two_languages/",
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                    {"locale": "de", "name": "deutsch"},
+                ],
+            },
+        },
+    )
+    file = files.get_file_from_path("index.md")
+    assert file.locale == "en"
+    assert file.locale_alternate_of == "en"
+    assert file.norm_src_uri == "index.md"
+    # alternates list the file itself first, then the other languages
+    assert list(file.alternates) == ["en", "de", "fr"]
+    assert file.alternates["en"] is file
+    assert "fr" in file.alternates
+    assert "es" not in file.alternates
+    assert file.alternates.get("es") is None
+    # alternates of other locales are kept like in a dict
+    file.alternates["es"] = file.alternates["fr"]
+    assert list(file.alternates) == ["en", "de", "fr", "es"]
+    assert file.alternates["es"] is file.alternates["fr"]
+    assert len(file.alternates) == 4
+    del file.alternates["es"]
+    assert "es" not in file.alternates
+    with pytest.raises(KeyError):
+        del file.alternates["es"]
+    assert len(file.alternates) == 3
+    # the language classification is shared by every language build
+    assert file.alternates["de"].i18n_info is file.i18n_info
+
+
+def test_catalog_shares_static_files(make_config):
+    mkdocs_config, files, env, nav = make_config(
+        "tests/mkdocs.yml",
+        docs_dir="docs_suffix_structure_two_languages/",
+        plugins={
+            "i18n": {
+                "languages": [
+                    {"locale": "en", "name": "english", "default": True},
+                    {"locale": "fr", "name": "français"},
+                ],
+            },
+        },
+    )
+    catalog = mkdocs_config.plugins["i18n"].i18n_catalog
+    image = catalog.get_file("image.png", "en")
+    # static files are the same in every language build
+    i18n_image = catalog.get_i18n_file(image, "en")
+    assert catalog.get_i18n_file(image, "en") is i18n_image
+    assert catalog.get_alternate("image.png", "en").file is i18n_image
+    # unless they got moved in place by another plugin
+    i18n_image.dest_uri = "blog/image.png"
+    assert catalog.get_i18n_file(image, "en") is not i18n_image
+    # documentation pages get a new Page in every language build
+    index = catalog.get_file("index.md", "en")
+    assert catalog.get_i18n_file(index, "en") is not catalog.get_i18n_file(index, "en")